@@ -0,0 +1,54 @@
+"""Simulation steps/second versus number of players, with and without the
+spatial-hash broadphase.
+
+Every player gets a random action each frame. The field is 1600x1600 so
+that two full teams of 18 fit with room to move. Run from the repository
+root:
+
+    python -m benchmarks.broadphase [steps]
+"""
+import random
+import sys
+import time
+import numpy as np
+
+from src.components.ball import Ball
+from src.components.player import Player
+from src.simulation.broadphase import SpatialHash
+from src.simulation.simulation import Simulation
+
+WIDTH = HEIGHT = 1600
+FPS = 60
+STEPS = 2_000
+PLAYER_COUNTS = [1, 2, 4, 8, 12, 18, 24, 36]
+SEED = 0
+
+
+def steps_per_second(num_players: int, broadphase: bool, steps: int) -> float:
+    random.seed(SEED)
+    rng = np.random.default_rng(SEED)
+    actions = np.zeros((steps, num_players, 4), dtype=np.int64)
+    moves = rng.integers(0, 4, size=(steps, num_players))
+    np.put_along_axis(actions, moves[..., None], 1, axis=2)
+
+    sim = Simulation(WIDTH, HEIGHT, steps, num_players)
+    sim.broadphase = (
+        SpatialHash(2 * max(Player.radius, Ball.radius)) if broadphase else None
+    )
+    sim.reset()
+    dt = 1 / FPS
+    start = time.perf_counter()
+    for frame_actions in actions:
+        sim.step(dt, frame_actions)
+    return steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else STEPS
+    print(f"{'players':>7s} {'all pairs':>12s} {'spatial hash':>13s} {'speedup':>8s}")
+    for num_players in PLAYER_COUNTS:
+        brute = steps_per_second(num_players, False, steps)
+        grid = steps_per_second(num_players, True, steps)
+        print(
+            f"{num_players:7d} {brute:10.0f}/s {grid:11.0f}/s {grid / brute:7.2f}x"
+        )
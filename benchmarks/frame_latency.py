@@ -0,0 +1,43 @@
+"""Per-frame latency of a single headless Simulation.
+
+Run from the repository root:
+
+    python -m benchmarks.frame_latency [steps]
+"""
+import sys
+import time
+import random
+import numpy as np
+
+from src.simulation.simulation import Simulation
+
+WIDTH = HEIGHT = 400
+FPS = 60
+STEPS = 100_000
+SEED = 0
+
+
+def bench_frame_latency(steps: int) -> np.ndarray:
+    random.seed(SEED)
+    rng = np.random.default_rng(SEED)
+    actions = np.zeros((steps, 4), dtype=int)
+    actions[np.arange(steps), rng.integers(0, 4, size=steps)] = 1
+
+    sim = Simulation(WIDTH, HEIGHT, steps)
+    sim.reset()
+    dt = 1 / FPS
+    clock = time.perf_counter_ns
+    latencies = np.empty(steps, dtype=np.int64)
+    for ix, action in enumerate(actions):
+        start = clock()
+        sim.step(dt, action)
+        latencies[ix] = clock() - start
+    return latencies
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else STEPS
+    latencies = bench_frame_latency(steps)
+    print(f"mean: {latencies.mean() / 1000:8.2f} us/frame")
+    print(f"p50:  {np.percentile(latencies, 50) / 1000:8.2f} us/frame")
+    print(f"p99:  {np.percentile(latencies, 99) / 1000:8.2f} us/frame")
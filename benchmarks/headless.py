@@ -0,0 +1,63 @@
+"""Steps/second of the headless Simulation against the rendered Game.
+
+Run from the repository root:
+
+    python -m benchmarks.headless [steps]
+"""
+import sys
+import time
+import random
+import numpy as np
+
+from src.simulation.simulation import Simulation
+from src.game.game import Game
+
+WIDTH = HEIGHT = 400
+FPS = 60
+STEPS = 20_000
+SEED = 0
+
+
+def random_actions(steps: int) -> np.ndarray:
+    rng = np.random.default_rng(SEED)
+    actions = np.zeros((steps, 4), dtype=int)
+    actions[np.arange(steps), rng.integers(0, 4, size=steps)] = 1
+    return actions
+
+
+def bench_headless(actions: np.ndarray) -> float:
+    random.seed(SEED)
+    sim = Simulation(WIDTH, HEIGHT, len(actions))
+    sim.reset()
+    dt = 1 / FPS
+    start = time.perf_counter()
+    for action in actions:
+        sim.step(dt, action)
+    return len(actions) / (time.perf_counter() - start)
+
+
+def bench_rendered(actions: np.ndarray) -> float:
+    random.seed(SEED)
+    game = Game(
+        width=WIDTH, height=HEIGHT, fps=1_000_000_000, game_duration_frames=len(actions)
+    )
+    game.reset_game()
+    dt = 1 / FPS
+    start = time.perf_counter()
+    for action in actions:
+        game.play_step(dt, action)
+    elapsed = time.perf_counter() - start
+    game.quit()
+    return len(actions) / elapsed
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else STEPS
+    actions = random_actions(steps)
+
+    headless = bench_headless(actions)
+    rendered = bench_rendered(actions)
+
+    print(f"headless: {headless:12.1f} steps/s")
+    print(f"rendered: {rendered:12.1f} steps/s")
+    print(f"speedup:  {headless / rendered:12.1f}x")
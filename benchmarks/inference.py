@@ -0,0 +1,71 @@
+"""Per-action cost of the action-selection paths.
+
+Compares the previous per-frame path (new tensor, autograd on) with
+``inference_mode``, the NumPy forward pass, batched NumPy and the int8
+dynamically quantized model. Run from the repository root:
+
+    python -m benchmarks.inference [repeats]
+"""
+import sys
+import time
+from typing import Callable, List, Tuple
+import numpy as np
+import torch
+
+from src.agent.agent import build_model
+from src.model.inference import NumpyPolicy, TorchPolicy, quantize_int8
+
+STATE_SIZE = 6
+BATCH_SIZE = 256
+REPEATS = 20_000
+SEED = 0
+
+
+def autograd_action(model: torch.nn.Module) -> Callable[[np.ndarray], int]:
+    # Agent.get_action before the inference paths existed
+    def act(state: np.ndarray) -> int:
+        prediction = model(torch.tensor(state, dtype=torch.float))
+        return int(torch.argmax(prediction).item())
+
+    return act
+
+
+def time_per_call(act: Callable[[np.ndarray], object], states: np.ndarray) -> float:
+    for state in states[:100]:
+        act(state)
+    start = time.perf_counter()
+    for state in states:
+        act(state)
+    return (time.perf_counter() - start) / len(states)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS
+    torch.manual_seed(SEED)
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(SEED)
+    states = rng.random((repeats, STATE_SIZE), dtype=np.float32)
+    batches = states[: repeats - repeats % BATCH_SIZE].reshape(
+        -1, BATCH_SIZE, STATE_SIZE
+    )
+
+    model = build_model()
+    numpy_policy = NumpyPolicy(model)
+    int8_policy = TorchPolicy(quantize_int8(model))
+
+    results: List[Tuple[str, float]] = [
+        ("autograd (previous)", time_per_call(autograd_action(model), states)),
+        ("inference_mode", time_per_call(TorchPolicy(model).act, states)),
+        ("numpy", time_per_call(numpy_policy.act, states)),
+        (
+            f"numpy batch of {BATCH_SIZE}",
+            time_per_call(numpy_policy.act_batch, batches) / BATCH_SIZE,
+        ),
+        ("int8 quantized", time_per_call(int8_policy.act, states)),
+    ]
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"{name:24s} {seconds * 1e6:8.2f} us/action {baseline / seconds:7.1f}x")
+
+    agree = (numpy_policy.act_batch(states) == int8_policy.act_batch(states)).mean()
+    print(f"int8 picks the same action as float32 for {agree:.1%} of states")
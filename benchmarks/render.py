@@ -0,0 +1,67 @@
+"""Frame time of Game.draw versus a full redraw, at several window sizes.
+
+The full redraw is the previous renderer: fill the screen, draw every
+shape, the goals and the field, render the score text and flip. Both run
+the same seeded game. Run from the repository root, with
+SDL_VIDEODRIVER=dummy to time the drawing without a window:
+
+    python -m benchmarks.render [frames]
+"""
+import random
+import sys
+import time
+import numpy as np
+import pygame
+
+from src.game.game import WHITE, Game
+
+FPS = 60
+FRAMES = 2_000
+SIZES = [400, 800, 1600]
+SEED = 0
+
+
+def full_redraw(game: Game) -> None:
+    screen = game.screen
+    screen.fill("green")
+    for shape in game.sim.shapes:
+        game.draw_shape(shape.shape)
+    game.draw_goals(game.goals, screen)
+    game.draw_field(game.field, screen)
+    text = game.font.render(f"Score: {game.score}", True, WHITE)
+    screen.blit(text, game.score_text_pos)
+    pygame.display.flip()
+
+
+def frame_times(size: int, incremental: bool, frames: int) -> np.ndarray:
+    random.seed(SEED)
+    rng = np.random.default_rng(SEED)
+    actions = np.zeros((frames, 4), dtype=np.int64)
+    actions[np.arange(frames), rng.integers(0, 4, size=frames)] = 1
+
+    game = Game(height=size, width=size, fps=FPS, game_duration_frames=frames)
+    game.reset_game()
+    dt = 1 / FPS
+    times = np.empty(frames, dtype=np.int64)
+    clock = time.perf_counter_ns
+    for ix, action in enumerate(actions):
+        game.sim.step(dt, action)
+        start = clock()
+        if incremental:
+            game.draw()
+        else:
+            full_redraw(game)
+        times[ix] = clock() - start
+    return times
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else FRAMES
+    print(f"{'size':>9s} {'full p50':>10s} {'dirty p50':>10s} {'speedup':>8s}")
+    for size in SIZES:
+        full = np.median(frame_times(size, False, frames)) / 1000
+        dirty = np.median(frame_times(size, True, frames)) / 1000
+        print(
+            f"{size:4d}x{size:<4d} {full:7.1f} us {dirty:7.1f} us {full / dirty:7.2f}x"
+        )
+    pygame.quit()
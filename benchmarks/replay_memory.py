@@ -0,0 +1,72 @@
+"""Memory footprint and sampling time of ReplayMemory vs the old deque.
+
+Run from the repository root:
+
+    python -m benchmarks.replay_memory
+"""
+import random
+import time
+import tracemalloc
+from collections import deque
+import numpy as np
+import torch
+
+from src.agent.replay_memory import ReplayMemory
+
+CAPACITY = 100_000
+BATCH_SIZE = 1_000
+STATE_SIZE = 6
+SAMPLES = 20
+SEED = 0
+
+
+def fill_deque() -> deque:
+    memory: deque = deque(maxlen=CAPACITY)
+    rng = np.random.default_rng(SEED)
+    for _ in range(CAPACITY):
+        action = np.zeros(4, dtype=np.int64)
+        action[rng.integers(0, 4)] = 1
+        memory.append(
+            (rng.random(STATE_SIZE), action, 0, rng.random(STATE_SIZE), False)
+        )
+    return memory
+
+
+def sample_deque(memory: deque) -> None:
+    mini_sample = random.sample(memory, BATCH_SIZE)
+    states, actions, rewards, next_states, game_overs = zip(*mini_sample)
+    torch.tensor(np.array(states), dtype=torch.float)
+    torch.tensor(np.array(actions), dtype=torch.float)
+    torch.tensor(rewards, dtype=torch.float)
+    torch.tensor(np.array(next_states), dtype=torch.float)
+
+
+def fill_ring() -> ReplayMemory:
+    memory = ReplayMemory(CAPACITY, STATE_SIZE, seed=SEED)
+    rng = np.random.default_rng(SEED)
+    for _ in range(CAPACITY):
+        memory.append(
+            rng.random(STATE_SIZE), rng.integers(0, 4), 0, rng.random(STATE_SIZE), False
+        )
+    return memory
+
+
+def measure(fill, sample) -> None:  # type: ignore
+    tracemalloc.start()
+    memory = fill()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(SAMPLES):
+        sample(memory)
+    elapsed = (time.perf_counter() - start) / SAMPLES
+    print(f"  memory: {peak / 2**20:8.1f} MiB, sample: {elapsed * 1000:8.3f} ms/batch")
+
+
+if __name__ == "__main__":
+    random.seed(SEED)
+    print(f"deque of tuples ({CAPACITY} transitions)")
+    measure(fill_deque, sample_deque)
+    print(f"ReplayMemory ({CAPACITY} transitions)")
+    measure(fill_ring, lambda memory: memory.sample(BATCH_SIZE))
@@ -0,0 +1,59 @@
+"""Startup time of each main.py mode, from interpreter launch to ready.
+
+Each mode is loaded in a fresh interpreter via ``main.load_mode`` without
+running it, and the slowest top-level imports are listed from
+``-X importtime``. Run from the repository root:
+
+    python -m benchmarks.startup [repeats]
+"""
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+MODES = ["train", "train-vec", "train-mp", "play", "human"]
+REPEATS = 5
+TOP_IMPORTS = 3
+
+
+def load_command(mode: str) -> str:
+    return f"import main; main.load_mode({mode!r})"
+
+
+def time_command(command: str, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", command], check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def slowest_imports(command: str) -> List[Tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", command],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):  # top-level imports only
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:TOP_IMPORTS]
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS
+    print(f"{'python':10s} {time_command('pass', repeats) * 1000:8.1f} ms")
+    for mode in MODES:
+        command = load_command(mode)
+        median = time_command(command, repeats)
+        top = ", ".join(
+            f"{name} {us / 1000:.0f} ms" for us, name in slowest_imports(command)
+        )
+        print(f"{mode:10s} {median * 1000:8.1f} ms  ({top})")
@@ -0,0 +1,339 @@
+"""Micro-benchmarks for the simulation and learning hot paths.
+
+Every benchmark runs a fixed, seeded scenario and reports ops/sec, p50/p99
+latency per op and the peak Python allocation during one sample, as JSON.
+Run from the repository root:
+
+    python -m benchmarks.suite [-o results.json] [-k filter] [--no-render]
+    python -m benchmarks.suite --compare before.json after.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.agent.replay_memory import ReplayMemory
+    from src.simulation.simulation import Simulation
+
+WIDTH = HEIGHT = 400
+FPS = 60
+SEED = 0
+SAMPLES = 200
+WARMUP_SAMPLES = 10
+
+Op = Callable[[], object]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Op]
+    inner: int  # ops timed together per sample, to amortise timer overhead
+    rendered: bool = False
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    peak_alloc_bytes: int
+    samples: int
+    inner: int
+
+
+def seed_everything() -> None:
+    import torch
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+    torch.manual_seed(SEED)
+
+
+def random_moves(n: int) -> np.ndarray:
+    rng = np.random.default_rng(SEED)
+    moves = np.zeros((n, 4), dtype=np.int64)
+    moves[np.arange(n), rng.integers(0, 4, size=n)] = 1
+    return moves
+
+
+def make_simulation() -> Simulation:
+    from src.simulation.simulation import Simulation
+
+    sim = Simulation(WIDTH, HEIGHT, 1_000_000_000)
+    sim.reset()
+    return sim
+
+
+def setup_shape_update() -> Op:
+    from src.components.shape import Shape
+
+    shape = Shape((WIDTH / 2, HEIGHT / 2), 40.0, "blue")
+    dt = 1 / FPS
+
+    def op() -> None:
+        shape.vx = 30.0
+        shape.vy = -20.0
+        shape.update(dt)
+
+    return op
+
+
+def setup_field_resolve_collisions() -> Op:
+    sim = make_simulation()
+    # Player pressed into the left wall, ball in open play
+    player, ball = sim.player.shape, sim.ball.shape
+    field = sim.field
+
+    def op() -> None:
+        player.place(field.pos[0] + player.radius - 1.0, HEIGHT / 2)
+        ball.place(WIDTH / 2, HEIGHT / 2)
+        field.resolve_collisions(sim.shapes)
+
+    return op
+
+
+def setup_goals_check_goal() -> Op:
+    sim = make_simulation()
+    ball = sim.ball.shape
+    ball.place(WIDTH / 2, HEIGHT * 0.16)
+    ball.vy = -60.0
+    dt = 1 / FPS
+    return lambda: sim.goals.check_goal(sim.ball, dt)
+
+
+def setup_agent_get_state() -> Op:
+    from src.agent.agent import Agent
+
+    sim = make_simulation()
+    return lambda: Agent.get_state(sim)
+
+
+def setup_agent_get_action() -> Op:
+    from src.agent.agent import Agent
+
+    agent = Agent()
+    state = Agent.get_state(make_simulation())
+    return lambda: agent.get_action(state)
+
+
+def setup_replay_memory_sample() -> Op:
+    from src.agent.agent import BATCH_SIZE, STATE_SIZE
+    from src.agent.replay_memory import ReplayMemory
+
+    memory = fill_memory(ReplayMemory(100_000, STATE_SIZE, seed=SEED), 100_000)
+    return lambda: memory.sample(BATCH_SIZE)
+
+
+def setup_trainer_train_step() -> Op:
+    from src.agent.agent import BATCH_SIZE, STATE_SIZE, Agent
+    from src.agent.replay_memory import ReplayMemory
+
+    agent = Agent()
+    memory = fill_memory(ReplayMemory(10_000, STATE_SIZE, seed=SEED), 10_000)
+    batch = memory.sample(BATCH_SIZE)
+    return lambda: agent.trainer.train_step(*batch)
+
+
+def setup_simulation_step() -> Op:
+    sim = make_simulation()
+    return play_steps(sim.step)
+
+
+def setup_game_play_step() -> Op:
+    from src.game.game import Game
+
+    game = Game(
+        width=WIDTH, height=HEIGHT, fps=1_000_000_000, game_duration_frames=1_000_000
+    )
+    game.reset_game()
+    return play_steps(game.play_step)
+
+
+def setup_train_frame() -> Op:
+    # One iteration of the train() loop body, headless
+    from src.agent.agent import Agent
+
+    agent = Agent()
+    sim = make_simulation()
+    dt = 1 / FPS
+    state_old = agent.get_state(sim)
+
+    def op() -> None:
+        nonlocal state_old
+        final_move = agent.get_action(state_old)
+        reward, game_over, _ = sim.step(dt, final_move)
+        state_new = agent.get_state(sim)
+        agent.remember(state_old, final_move, reward, state_new, game_over)
+        state_old = state_new
+
+    return op
+
+
+def play_steps(step: Callable[[float, np.ndarray], object]) -> Op:
+    moves = random_moves(1024)
+    dt = 1 / FPS
+    ix = 0
+
+    def op() -> None:
+        nonlocal ix
+        step(dt, moves[ix])
+        ix = (ix + 1) % len(moves)
+
+    return op
+
+
+def fill_memory(memory: ReplayMemory, n: int) -> ReplayMemory:
+    rng = np.random.default_rng(SEED)
+    memory.extend(
+        rng.random((n, memory.state_size), dtype=np.float32),
+        rng.integers(0, 4, size=n),
+        rng.choice([-5.0, 0.0, 100.0, 500.0], size=n),
+        rng.random((n, memory.state_size), dtype=np.float32),
+        rng.random(n) < 0.001,
+    )
+    return memory
+
+
+BENCHMARKS = [
+    Benchmark("shape.update", setup_shape_update, inner=1000),
+    Benchmark("field.resolve_collisions", setup_field_resolve_collisions, inner=1000),
+    Benchmark("goals.check_goal", setup_goals_check_goal, inner=1000),
+    Benchmark("agent.get_state", setup_agent_get_state, inner=100),
+    Benchmark("agent.get_action", setup_agent_get_action, inner=100),
+    Benchmark("replay_memory.sample", setup_replay_memory_sample, inner=1),
+    Benchmark("trainer.train_step", setup_trainer_train_step, inner=1),
+    Benchmark("simulation.step", setup_simulation_step, inner=100),
+    Benchmark("game.play_step", setup_game_play_step, inner=10, rendered=True),
+    Benchmark("train.frame", setup_train_frame, inner=10),
+]
+
+
+def run(benchmark: Benchmark, samples: int) -> Result:
+    seed_everything()
+    op = benchmark.setup()
+    inner = benchmark.inner
+    clock = time.perf_counter_ns
+
+    for _ in range(WARMUP_SAMPLES * inner):
+        op()
+
+    timings = np.empty(samples, dtype=np.int64)
+    for ix in range(samples):
+        start = clock()
+        for _ in range(inner):
+            op()
+        timings[ix] = clock() - start
+
+    tracemalloc.start()
+    for _ in range(inner):
+        op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_op_us = timings / inner / 1000
+    return Result(
+        name=benchmark.name,
+        ops_per_sec=samples * inner / (timings.sum() / 1e9),
+        p50_us=float(np.percentile(per_op_us, 50)),
+        p99_us=float(np.percentile(per_op_us, 99)),
+        peak_alloc_bytes=peak,
+        samples=samples,
+        inner=inner,
+    )
+
+
+def metadata() -> Dict[str, object]:
+    import torch
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "torch": torch.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "torch_threads": torch.get_num_threads(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = {r["name"]: r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {r["name"]: r for r in json.load(f)["results"]}
+    print(f"{'benchmark':28s} {'before p50':>12s} {'after p50':>12s} {'speedup':>8s}")
+    for name, result in after.items():
+        if name not in before:
+            continue
+        old, new = before[name]["p50_us"], result["p50_us"]
+        print(f"{name:28s} {old:10.2f}us {new:10.2f}us {old / new:7.2f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write JSON results here")
+    parser.add_argument("-k", "--filter", default="", help="substring of names")
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--threads", type=int, default=1, help="torch threads")
+    parser.add_argument("--no-render", action="store_true")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    import torch
+
+    torch.set_num_threads(args.threads)
+    if not os.environ.get("DISPLAY"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    results = []
+    for benchmark in BENCHMARKS:
+        if args.filter not in benchmark.name:
+            continue
+        if benchmark.rendered and args.no_render:
+            continue
+        result = run(benchmark, args.samples)
+        results.append(result)
+        print(
+            f"{result.name:28s} {result.ops_per_sec:14.1f} ops/s "
+            f"p50 {result.p50_us:10.2f}us p99 {result.p99_us:10.2f}us "
+            f"peak {result.peak_alloc_bytes / 1024:8.1f}KiB",
+            file=sys.stderr,
+        )
+
+    report = {"meta": metadata(), "results": [asdict(r) for r in results]}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Transitions/second of VecGame for increasing numbers of games.
+
+Run from the repository root:
+
+    python -m benchmarks.vec_game [steps]
+"""
+import sys
+import time
+import numpy as np
+
+from src.simulation.vec_game import VecGame
+
+WIDTH = HEIGHT = 400
+FPS = 60
+STEPS = 1_000
+SEED = 0
+NUM_GAMES = [1, 16, 256, 4096]
+
+
+def bench_vec_game(num_games: int, steps: int) -> float:
+    games = VecGame(num_games, WIDTH, HEIGHT, 1500, seed=SEED)
+    games.reset()
+    rng = np.random.default_rng(SEED)
+    actions = np.zeros((num_games, 4), dtype=np.int64)
+    dt = 1 / FPS
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions[:] = 0
+        actions[np.arange(num_games), rng.integers(0, 4, size=num_games)] = 1
+        games.step(dt, actions)
+    return num_games * steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else STEPS
+    for num_games in NUM_GAMES:
+        rate = bench_vec_game(num_games, steps)
+        print(f"{num_games:6d} games: {rate:14.1f} transitions/s")
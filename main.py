@@ -1,18 +1,109 @@
 #! /usr/bin/env python
+from __future__ import annotations
 import sys
+from typing import TYPE_CHECKING, Callable, Optional
 
-from src.agent.agent import train, play, play_human
+from src.profiling.profiler import Profiler
+
+if TYPE_CHECKING:
+    from src.simulation.recording import EpisodeRecorder
 
 
 HEIGHT = WIDTH = 400
 FPS = 60
 GAME_DURATION_FRAMES = 1500
+NUM_GAMES = 256
+NUM_ACTORS = 4
+SYNC_INTERVAL = 50  # learner updates between weight broadcasts
+TRACE_PATH = "./checkpoints/trace.json"
+RECORDING_PATH = "./checkpoints/episodes.bin"
+CAPTURE_PATH = "./checkpoints/frames"
+OBSERVATION_DOWNSAMPLE = 4
 
 
-if __name__ == "__main__":
-    if sys.argv[1] == "train":
-        train(WIDTH, HEIGHT, FPS, GAME_DURATION_FRAMES)
-    elif sys.argv[1] == "human":
-        play_human(WIDTH, HEIGHT, FPS, 1_000_000_000)
+def make_profiler() -> Profiler:
+    # --profile prints phase timings; --trace also writes a Chrome trace
+    trace = "--trace" in sys.argv
+    return Profiler(
+        enabled=trace or "--profile" in sys.argv,
+        trace_path=TRACE_PATH if trace else None,
+    )
+
+
+def make_recorder() -> Optional[EpisodeRecorder]:
+    # --record saves actions; --record-states also saves positions
+    record_states = "--record-states" in sys.argv
+    if not record_states and "--record" not in sys.argv:
+        return None
+    from src.simulation.recording import EpisodeRecorder
+
+    return EpisodeRecorder(RECORDING_PATH, record_states=record_states)
+
+
+def load_mode(mode: str) -> Callable[[], None]:
+    # Each mode imports only what it runs, so e.g. `human` never loads torch
+    if mode == "train":
+        from src.agent.agent import UPDATE_TO_DATA, train
+
+        return lambda: train(
+            WIDTH,
+            HEIGHT,
+            FPS,
+            GAME_DURATION_FRAMES,
+            render="--render" in sys.argv,
+            profiler=make_profiler(),
+            recorder=make_recorder(),
+            # --concurrent trains on a learner thread while games go on
+            update_to_data=UPDATE_TO_DATA if "--concurrent" in sys.argv else None,
+        )
+    elif mode == "train-vec":
+        from src.agent.agent import train_vectorized
+
+        return lambda: train_vectorized(
+            WIDTH, HEIGHT, FPS, GAME_DURATION_FRAMES, NUM_GAMES
+        )
+    elif mode == "train-mp":
+        from src.agent.actor_learner import train_distributed
+
+        return lambda: train_distributed(
+            WIDTH, HEIGHT, FPS, GAME_DURATION_FRAMES, NUM_ACTORS, SYNC_INTERVAL
+        )
+    elif mode == "capture":
+        from src.agent.agent import capture
+
+        # --png writes an image sequence; --obs writes downsampled greyscale
+        observations = "--obs" in sys.argv
+        fmt = "png" if "--png" in sys.argv else "raw"
+        channels = "gray" if observations else "rgb"
+        return lambda: capture(
+            WIDTH,
+            HEIGHT,
+            FPS,
+            GAME_DURATION_FRAMES,
+            CAPTURE_PATH if fmt == "png" else f"{CAPTURE_PATH}.{channels}",
+            fmt=fmt,
+            downsample=OBSERVATION_DOWNSAMPLE if observations else 1,
+            greyscale=observations,
+        )
+    elif mode == "human":
+        from src.game.human import play_human
+
+        return lambda: play_human(WIDTH, HEIGHT, FPS, 1_000_000_000)
     else:
-        play(WIDTH, HEIGHT, FPS, GAME_DURATION_FRAMES)
+        from src.agent.agent import play
+
+        return lambda: play(
+            WIDTH,
+            HEIGHT,
+            FPS,
+            GAME_DURATION_FRAMES,
+            profiler=make_profiler(),
+            quantize="--int8" in sys.argv,
+            recorder=make_recorder(),
+            speed=None if "--fast" in sys.argv else 1.0,
+            threaded="--render-thread" in sys.argv,
+        )
+
+
+if __name__ == "__main__":
+    load_mode(sys.argv[1])()
@@ -0,0 +1,251 @@
+"""Multi-process training: K actors play games, one learner trains.
+
+Each actor runs its own headless ``Simulation`` with a local copy of
+``Linear_QNet`` and streams transitions to the learner in fixed-size
+chunks over a multiprocessing queue. The learner owns the ``QTrainer`` and
+the replay memory, and every ``sync_interval`` updates it copies its
+weights into a shared-memory model that actors reload from.
+"""
+from __future__ import annotations
+import queue
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional
+import numpy as np
+import torch
+from torch import multiprocessing as mp
+from torch import nn
+
+from src.agent.agent import (
+    ACTION_REPEAT,
+    ACTION_SIZE,
+    STATE_SIZE,
+    Agent,
+    build_model,
+    resume_agent,
+)
+from src.model.inference import NumpyPolicy
+from src.simulation.simulation import Simulation
+
+CHUNK_SIZE = 256  # transitions per message from an actor
+QUEUE_CHUNKS_PER_ACTOR = 4
+REPORT_INTERVAL = 10.0  # seconds
+
+
+@dataclass
+class ActorConfig:
+    width: int
+    height: int
+    fps: int
+    game_duration_frames: int
+    seed: int
+
+
+@dataclass
+class Episode:
+    score: int
+    total_reward: float
+    frames: int
+
+
+@dataclass
+class Chunk:
+    actor_id: int
+    states: np.ndarray
+    actions: np.ndarray
+    rewards: np.ndarray
+    next_states: np.ndarray
+    game_overs: np.ndarray
+    episodes: List[Episode]
+
+
+def run_actor(
+    actor_id: int,
+    config: ActorConfig,
+    transitions: Any,
+    shared_model: nn.Module,
+    weights_version: Any,
+) -> None:
+    # One core per actor; the learner gets the rest
+    torch.set_num_threads(1)
+    random.seed(config.seed)
+
+    model = build_model()
+    # Weight reloads are in place, so the policy always sees the latest
+    policy = NumpyPolicy(model)
+    local_version = -1
+
+    sim = Simulation(config.width, config.height, config.game_duration_frames)
+    sim.reset()
+    dt = 1 / config.fps
+    frame_count = 0
+    total_reward = 0.0
+
+    states = np.empty((CHUNK_SIZE, STATE_SIZE), dtype=np.float32)
+    actions = np.empty(CHUNK_SIZE, dtype=np.uint8)
+    rewards = np.empty(CHUNK_SIZE, dtype=np.float32)
+    next_states = np.empty((CHUNK_SIZE, STATE_SIZE), dtype=np.float32)
+    game_overs = np.empty(CHUNK_SIZE, dtype=np.bool_)
+    episodes: List[Episode] = []
+    move = np.zeros(ACTION_SIZE, dtype=np.int64)
+
+    state_old = Agent.get_state(sim)
+    ix = 0
+    while True:
+        if weights_version.value != local_version:
+            with weights_version.get_lock():
+                model.load_state_dict(shared_model.state_dict())
+                local_version = weights_version.value
+
+        action = policy.act(state_old)
+        move[:] = 0
+        move[action] = 1
+
+        repeat = min(ACTION_REPEAT, config.game_duration_frames - frame_count)
+        reward, game_over, score = sim.step_repeat(dt, move, repeat)
+        state_new = Agent.get_state(sim)
+        total_reward += reward
+        frame_count += repeat
+        if frame_count >= config.game_duration_frames:
+            game_over = True
+
+        states[ix] = state_old
+        actions[ix] = action
+        rewards[ix] = reward
+        next_states[ix] = state_new
+        game_overs[ix] = game_over
+        ix += 1
+
+        if game_over:
+            episodes.append(Episode(score, total_reward, frame_count))
+            sim.reset()
+            frame_count = 0
+            total_reward = 0.0
+            state_new = Agent.get_state(sim)
+        state_old = state_new
+
+        if ix == CHUNK_SIZE:
+            # Blocks when the learner falls behind, which throttles actors
+            transitions.put(
+                Chunk(
+                    actor_id,
+                    states.copy(),
+                    actions.copy(),
+                    rewards.copy(),
+                    next_states.copy(),
+                    game_overs.copy(),
+                    episodes,
+                )
+            )
+            episodes = []
+            ix = 0
+
+
+def broadcast_weights(
+    model: nn.Module, shared_model: nn.Module, weights_version: Any
+) -> None:
+    with weights_version.get_lock():
+        shared_model.load_state_dict(model.state_dict())
+        weights_version.value += 1
+
+
+def train_distributed(
+    width: int,
+    height: int,
+    fps: int,
+    game_duration_frames: int,
+    num_actors: int,
+    sync_interval: int,
+) -> None:
+    print(f"Setting up training with {num_actors} actor processes...")
+    record = 0
+    agent = Agent()
+    plot_scores, plot_mean_scores, skip_next_checkpoint_save, metrics = (
+        resume_agent(agent)
+    )
+
+    ctx = mp.get_context("spawn")
+    transitions = ctx.Queue(maxsize=num_actors * QUEUE_CHUNKS_PER_ACTOR)
+    shared_model = build_model()
+    shared_model.share_memory()
+    weights_version = ctx.Value("i", 0)
+    broadcast_weights(agent.model, shared_model, weights_version)
+
+    actors = []
+    base_seed = random.randrange(2**31)
+    for actor_id in range(num_actors):
+        config = ActorConfig(
+            width, height, fps, game_duration_frames, seed=base_seed + actor_id
+        )
+        actor = ctx.Process(
+            target=run_actor,
+            args=(actor_id, config, transitions, shared_model, weights_version),
+            daemon=True,
+        )
+        actor.start()
+        actors.append(actor)
+
+    received = np.zeros(num_actors, dtype=np.int64)
+    n_updates = 0
+    report_start = time.perf_counter()
+    try:
+        while True:
+            chunk: Optional[Chunk]
+            try:
+                chunk = transitions.get(timeout=REPORT_INTERVAL)
+            except queue.Empty:
+                chunk = None
+
+            if chunk is not None:
+                agent.memory.extend(
+                    chunk.states,
+                    chunk.actions,
+                    chunk.rewards,
+                    chunk.next_states,
+                    chunk.game_overs,
+                )
+                received[chunk.actor_id] += len(chunk.states)
+
+                for episode in chunk.episodes:
+                    score = episode.score
+                    agent.n_games += 1
+                    if score > record:
+                        record = score
+                        if not skip_next_checkpoint_save:
+                            agent.save_checkpoint(score, plot_scores, plot_mean_scores)
+                        skip_next_checkpoint_save = False
+                    print(f"Game {agent.n_games}, {score=}, {record=}")
+
+                    plot_scores.append(score)
+                    plot_mean_scores.append(
+                        metrics.log(
+                            score, episode.total_reward, episode.frames, agent.epsilon
+                        )
+                    )
+
+                agent.train_long_memory()
+                n_updates += 1
+                if n_updates % sync_interval == 0:
+                    broadcast_weights(agent.model, shared_model, weights_version)
+
+            elapsed = time.perf_counter() - report_start
+            if elapsed >= REPORT_INTERVAL:
+                report_throughput(received, elapsed)
+                received[:] = 0
+                report_start = time.perf_counter()
+    finally:
+        for actor in actors:
+            actor.terminate()
+        for actor in actors:
+            actor.join()
+
+
+def report_throughput(received: np.ndarray, elapsed: float) -> None:
+    rates = [
+        f"{actor_id}: {count / elapsed:.0f}" for actor_id, count in enumerate(received)
+    ]
+    print(
+        f"Throughput {received.sum() / elapsed:.0f} transitions/s "
+        f"(per actor {', '.join(rates)})"
+    )
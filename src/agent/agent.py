@@ -1,16 +1,37 @@
-import torch
+from __future__ import annotations
+import copy
 import random
-import pygame
 import time
+from contextlib import nullcontext
+import torch
 import numpy as np
 from collections import deque
-from typing import Any, Tuple, Deque, List
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Optional,
+    Tuple,
+    List,
+    Union,
+)
 import os
 
-from src.game.game import Game
-from src.types.actionarr import ActionArr, StateArr
+from src.simulation.simulation import Simulation
+from src.simulation.vec_game import VecGame
+from src.agent.replay_memory import PrioritizedReplayMemory, ReplayMemory
+from src.checkpoints.manager import PARTS, CheckpointManager, load_parts
+from src.checkpoints.replay_store import ReplayStore
+from src.checkpoints.writer import CheckpointJob, CheckpointWriter
+from src.model.inference import NumpyPolicy, TorchPolicy, quantize_int8
 from src.model.model import Linear_QNet, QTrainer
-from src.visuals.plot import plot
+from src.profiling.profiler import NULL_PROFILER, Profiler
+from src.visuals.metrics import MetricsLog
+
+if TYPE_CHECKING:
+    from src.game.game import Game
+    from src.simulation.recording import EpisodeRecorder
+    from src.types.actionarr import ActionArr, StateArr
 
 MAX_MEMORY = 100_000
 BATCH_SIZE = 1_000
@@ -20,63 +41,57 @@ HIDDEN1_SIZE = 32
 # HIDDEN3_SIZE = 32
 ACTION_SIZE = 4
 LR = 0.001
-
-Memory = Tuple[
-    StateArr,
-    ActionArr,
-    int,
-    StateArr,
-    bool,
-]
+GAMMA = 0.9  # discount rate, < 1
+GRADIENT_STEPS = 1  # per train_long_memory call
+TARGET_SYNC_STEPS: Optional[int] = None  # None: bootstrap from the live model
+PRIORITIZED_REPLAY = False  # sample by TD error instead of uniformly
+CHECKPOINT_DIRECTORY = "./checkpoints"
+REPLAY_DIRECTORY = "./checkpoints/replay"
+METRICS_PATH = "./checkpoints/metrics.csv"
+ACTION_REPEAT = 1  # physics frames per agent decision and stored transition
+UPDATE_TO_DATA = 0.01  # concurrent learner gradient steps per transition
+DISPLAY_FPS = 60  # draws per second in play(), independent of physics
+CAPTURE_FPS = 30  # frames per second of simulated time in capture()
+ONE_HOT_ACTIONS = np.eye(ACTION_SIZE, dtype=np.int64)
+
+
+def build_model() -> Linear_QNet:
+    return Linear_QNet(
+        input_size=STATE_SIZE,
+        hidden1_size=HIDDEN1_SIZE,
+        # hidden2_size=HIDDEN2_SIZE,
+        # hidden3_size=HIDDEN3_SIZE,
+        output_size=ACTION_SIZE,
+    )
 
 
 class Agent:
-    def __init__(self) -> None:
+    def __init__(self, seed: Optional[int] = None) -> None:
         self.n_games = 0
         self.epsilon = 0.0  # randomness
-        self.gamma = 0.9  # discount rate, < 1
-        self.memory: Deque[Any] = deque(maxlen=MAX_MEMORY)
-        self.model = Linear_QNet(
-            input_size=STATE_SIZE,
-            hidden1_size=HIDDEN1_SIZE,
-            # hidden2_size=HIDDEN2_SIZE,
-            # hidden3_size=HIDDEN3_SIZE,
-            output_size=ACTION_SIZE,
+        self.gamma = GAMMA
+        self.memory = (
+            PrioritizedReplayMemory(MAX_MEMORY, STATE_SIZE, seed)
+            if PRIORITIZED_REPLAY
+            else ReplayMemory(MAX_MEMORY, STATE_SIZE, seed)
         )
-        self.trainer = QTrainer(self.model, lr=LR, gamma=self.gamma)
-
-    def get_state(self, game: Game) -> StateArr:
-        inv_width = 1.0 / game.screen.get_width()
-
-        rel_ball_x = game.ball.shape.pos.x - game.player.shape.pos.x
-        rel_ball_y = game.ball.shape.pos.y - game.player.shape.pos.y
-        rel_goals_left_x = game.goals.left_pos.x - game.player.shape.pos.x
-        rel_goals_left_y = game.goals.left_pos.y - game.player.shape.pos.y
-        rel_goals_right_x = game.goals.right_pos.x - game.player.shape.pos.x
-        rel_goals_right_y = game.goals.right_pos.y - game.player.shape.pos.y
-
-        ball_angle = np.arctan2(rel_ball_y, rel_ball_x)
-        ball_distance = np.sqrt(rel_ball_y**2 + rel_ball_x**2) * inv_width
-
-        goals_left_angle = np.arctan2(rel_goals_left_y, rel_goals_left_x)
-        goals_left_distance = (
-            np.sqrt(rel_goals_left_y**2 + rel_goals_left_x**2) * inv_width
-        )
-
-        goals_right_angle = np.arctan2(rel_goals_right_y, rel_goals_right_x)
-        goals_right_distance = (
-            np.sqrt(rel_goals_right_y**2 + rel_goals_right_x**2) * inv_width
+        self.replay_store: Optional[ReplayStore] = None
+        self.checkpoint_writer: Optional[CheckpointWriter] = None
+        self.checkpoint_manager: Optional[CheckpointManager] = None
+        self.model = build_model()
+        # Acting never needs autograd; NumpyPolicy shares the model's weights
+        self.policy: Union[NumpyPolicy, TorchPolicy] = NumpyPolicy(self.model)
+        self.trainer = QTrainer(
+            self.model,
+            lr=LR,
+            gamma=self.gamma,
+            target_sync_steps=TARGET_SYNC_STEPS,
         )
 
-        state = [
-            ball_angle,
-            ball_distance,
-            goals_left_angle,
-            goals_left_distance,
-            goals_right_angle,
-            goals_right_distance,
-        ]
-        return np.array(state)
+    @staticmethod
+    def get_state(game: Simulation) -> StateArr:
+        # Buffers alternate between calls: see ObservationBuilder
+        return game.observe()
 
     def remember(
         self,
@@ -86,16 +101,35 @@ class Agent:
         next_state: StateArr,
         game_over: bool,
     ) -> None:
-        self.memory.append((state, action, reward, next_state, game_over))
+        self.memory.append(
+            state, int(np.argmax(action)), reward, next_state, game_over
+        )
 
-    def train_long_memory(self) -> None:
-        if len(self.memory) > BATCH_SIZE:
-            mini_sample = random.sample(self.memory, BATCH_SIZE)
-        else:
-            mini_sample = list(self.memory)
+    def remember_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        game_overs: np.ndarray,
+    ) -> None:
+        self.memory.extend(
+            states, np.argmax(actions, axis=1), rewards, next_states, game_overs
+        )
 
-        states, actions, rewards, next_states, game_overs = zip(*mini_sample)
-        self.trainer.train_step(states, actions, rewards, next_states, game_overs)
+    def train_long_memory(self) -> None:
+        if isinstance(self.memory, PrioritizedReplayMemory):
+            batch, weights, ixs = self.memory.sample_prioritized(BATCH_SIZE)
+            self.trainer.train_step(*batch, n_steps=GRADIENT_STEPS, weights=weights)
+            self.memory.update_priorities(ixs, self.trainer.td_errors.numpy())
+            return
+
+        states, actions, rewards, next_states, game_overs = self.memory.sample(
+            BATCH_SIZE
+        )
+        self.trainer.train_step(
+            states, actions, rewards, next_states, game_overs, n_steps=GRADIENT_STEPS
+        )
 
     def train_short_memory(
         self,
@@ -109,109 +143,205 @@ class Agent:
 
     def get_action(self, state: StateArr) -> ActionArr:
         self.epsilon = 80 - self.n_games
-        final_move = [0, 0, 0, 0]
         # if random.randint(0, 200) < self.epsilon:
         #     move = random.randint(0, 3)
         # else:
-        state0 = torch.tensor(state, dtype=torch.float)
-        prediction = self.model(state0)
-        move = int(torch.argmax(prediction).item())
+        move = self.policy.act(state)
+        return ONE_HOT_ACTIONS[move].copy()
+
+    def get_actions(self, states: np.ndarray) -> np.ndarray:
+        # Batched get_action: one forward pass for a (num_games, 6) array
+        return ONE_HOT_ACTIONS[self.policy.act_batch(states)]
 
-        final_move[move] = 1
-        return np.array(final_move)
+    def quantize_policy(self) -> None:
+        # Act with an int8 copy of the model; training still uses self.model
+        self.policy = TorchPolicy(quantize_int8(self.model))
 
     def play_game(self, game: Game, agent_id: str) -> None:
-        game.reset_game()
-        score = 0
-        clock = pygame.time.Clock()
-        running = True
-        start = time.time()
-        DT = game.fps / 1000  # Don't want training influenced by frame-rate
-
-        while running:
-            _, game_over, score = game.play_step(
-                DT, actions=self.get_action(self.get_state(game))
-            )
-            clock.tick(game.fps)
-            if game_over or (time.time() - start >= game.game_duration_frames):
-                running = False
+        from src.game.frame_loop import run_decoupled
 
-        pygame.quit()
-        print(f"Agent {agent_id} got score {score}")
+        game.reset_game()
+        sim = game.sim
+        dt = 1 / game.fps  # the same step as training, whatever the display
+        frames_left = game.game_duration_frames
+
+        def step() -> int:
+            nonlocal frames_left
+            if frames_left <= 0:
+                return 0
+            sim.step(dt, self.get_action(self.get_state(sim)))
+            frames_left -= 1
+            return 1
+
+        run_decoupled(game, step)
+        game.quit()
+        print(f"Agent {agent_id} got score {sim.score}")
 
     def save_checkpoint(
-        self, checkpoint_name: str, scores: List[int], mean_scores: List[float]
+        self, score: int, scores: List[int], mean_scores: List[float]
     ) -> None:
+        # Only snapshot here; the background writer does the slow part.
+        # Replay data lives in a shared append-only store; the checkpoint
+        # file only records how far into that store it reaches. The game
+        # count keeps names unique across resumed runs
+        file_path = os.path.join(
+            CHECKPOINT_DIRECTORY, f"{score:04}_g{self.n_games:06}_checkpoint.tar"
+        )
         checkpoint = {
-            "model": self.model.state_dict(),
-            "optimizer": self.trainer.optimizer.state_dict(),
-            "memory": self.memory,
-            "scores": scores,
-            "mean_scores": mean_scores,
+            "model": {
+                key: value.detach().clone()
+                for key, value in self.model.state_dict().items()
+            },
+            "optimizer": copy.deepcopy(self.trainer.optimizer.state_dict()),
+            "replay_total": self.memory.total,
+            "scores": list(scores),
+            "mean_scores": list(mean_scores),
         }
-        file_path = f"./checkpoints/{checkpoint_name}.tar"
-        if not os.path.isfile(file_path):
-            torch.save(checkpoint, f"./checkpoints/{checkpoint_name}.tar")
+        replay, replay_start = self.get_replay_store().snapshot(self.memory)
+        self.get_checkpoint_writer().submit(
+            CheckpointJob(
+                file_path, checkpoint, replay, replay_start, score, self.n_games
+            )
+        )
 
     def load_checkpoint(
         self, full_checkpoint_filepath: str, train: bool = False
     ) -> Tuple[List[int], List[float]]:
-        checkpoint = torch.load(full_checkpoint_filepath)
+        # Playing only needs the weights (and history, which is small)
+        checkpoint = load_parts(
+            full_checkpoint_filepath, PARTS if train else ("model", "history")
+        )
         self.model.load_state_dict(checkpoint["model"])
-        self.trainer.optimizer.load_state_dict(checkpoint["optimizer"])
+        self.trainer.sync_target_model()
 
         if train:
+            self.trainer.optimizer.load_state_dict(checkpoint["optimizer"])
             self.model.train()
-            self.memory = checkpoint["memory"]
+            if "memory" not in checkpoint:
+                replay_total = checkpoint["replay_total"]
+                self.memory.load_state_dict(
+                    self.get_replay_store().load(replay_total)
+                )
+                self.memory.total = replay_total
+            elif isinstance(checkpoint["memory"], deque):
+                self.memory.extend_from_tuples(checkpoint["memory"])
+            else:
+                self.memory.load_state_dict(checkpoint["memory"])
         else:
             self.model.eval()
 
         return checkpoint["scores"], checkpoint["mean_scores"]
 
+    def get_replay_store(self) -> ReplayStore:
+        if self.replay_store is None:
+            self.replay_store = ReplayStore(REPLAY_DIRECTORY, STATE_SIZE, MAX_MEMORY)
+        return self.replay_store
+
+    def get_checkpoint_manager(self) -> CheckpointManager:
+        if self.checkpoint_manager is None:
+            self.checkpoint_manager = CheckpointManager(CHECKPOINT_DIRECTORY)
+        return self.checkpoint_manager
 
-def train(width: int, height: int, fps: int, game_duration_frames: int) -> None:
+    def get_checkpoint_writer(self) -> CheckpointWriter:
+        if self.checkpoint_writer is None:
+            self.checkpoint_writer = CheckpointWriter(
+                self.get_replay_store(), manager=self.get_checkpoint_manager()
+            )
+        return self.checkpoint_writer
+
+    def close(self) -> None:
+        # Flush checkpoints still being written in the background
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.close()
+            self.checkpoint_writer = None
+
+
+def train(
+    width: int,
+    height: int,
+    fps: int,
+    game_duration_frames: int,
+    render: bool = False,
+    profiler: Profiler = NULL_PROFILER,
+    recorder: Optional[EpisodeRecorder] = None,
+    action_repeat: int = ACTION_REPEAT,
+    update_to_data: Optional[float] = None,
+    seed: Optional[int] = None,
+    max_games: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+) -> None:
+    # With update_to_data set, a LearnerThread trains at that many updates
+    # per transition while games go on, instead of once after each game.
+    # Without max_games or max_seconds, trains until interrupted
     print("Setting up training...")
-    plot_scores: List[int] = []
-    plot_mean_scores: List[float] = []
-    total_score = 0
     record = 0
-    skip_next_checkpoint_save = False
-    agent = Agent()
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+    agent = Agent(seed)
+
+    plot_scores, plot_mean_scores, skip_next_checkpoint_save, metrics = (
+        resume_agent(agent)
+    )
 
-    checkpoint_filename = get_latest_checkpoint_filename()
-    if checkpoint_filename:
-        plot_scores, plot_mean_scores = agent.load_checkpoint(checkpoint_filename)
-        total_score = sum(plot_scores)
-        agent.n_games = len(plot_scores)
+    # Headless by default: only pay for pygame when someone is watching
+    if render:
+        from src.game.game import Game
 
-        skip_next_checkpoint_save = True
-        print(f"Loaded state from from {checkpoint_filename}")
+        game = Game(
+            width=width,
+            height=height,
+            fps=1_000_000_000,
+            game_duration_frames=game_duration_frames,
+        )
+        game.profiler = profiler
+        sim = game.sim
+        reset_game = game.reset_game
+        play_step = game.play_step
     else:
-        print("No checkpoint file found. Starting from scratch")
-
-    # get latest checkpoint
-    game = Game(
-        width=width,
-        height=height,
-        fps=1_000_000_000,
-        game_duration_frames=game_duration_frames,
-    )
-    game.reset_game()
+        sim = Simulation(width, height, game_duration_frames)
+        reset_game = sim.reset
+        play_step = sim.step_repeat
+
+    learner = None
+    remember: Callable[..., None] = agent.remember
+    paused: Callable[[], ContextManager[None]] = nullcontext
+    if update_to_data is not None:
+        from src.agent.learner_thread import LearnerThread
+
+        learner = LearnerThread(agent, update_to_data)
+        learner.start()
+        remember = learner.remember
+        paused = learner.paused
+
+    reset_game()
     dt = 1 / fps
     frame_count = 0
     total_reward = 0
+    phase = profiler.phase
+    if recorder is not None:
+        recorder.begin(sim)
+    # The new state of each step is the old state of the next one
+    state_old = agent.get_state(sim)
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+    last_game = None if max_games is None else agent.n_games + max_games
     while True:
-        # get old state
-        state_old = agent.get_state(game)
+        if learner is not None:
+            learner.sync()
 
         # get move
-        final_move = agent.get_action(state_old)
-
-        # perform move and get new state
-        reward, game_over, score = game.play_step(dt, final_move)
-        state_new = agent.get_state(game)
+        with phase("get_action"):
+            final_move = agent.get_action(state_old)
+
+        # perform move for up to action_repeat frames and get new state
+        repeat = min(action_repeat, game_duration_frames - frame_count)
+        with phase("play_step"):
+            reward, game_over, score = play_step(dt, final_move, repeat, recorder)
+        with phase("get_state"):
+            state_new = agent.get_state(sim)
         total_reward += reward
-        frame_count += 1
+        frame_count += repeat
 
         if frame_count >= game_duration_frames:
             game_over = True
@@ -220,88 +350,279 @@ def train(width: int, height: int, fps: int, game_duration_frames: int) -> None:
         # agent.train_short_memory(state_old, final_move, reward, state_new, game_over)
 
         # remmeber
-        agent.remember(state_old, final_move, reward, state_new, game_over)
+        with phase("remember"):
+            remember(state_old, final_move, reward, state_new, game_over)
 
         if game_over:
+            count_game_events(profiler, sim)
+            if recorder is not None:
+                with phase("record_episode"):
+                    recorder.end(sim, dt, score, total_reward)
+
             # train long memory
-            game.reset_game()
+            reset_game()
+            if recorder is not None:
+                recorder.begin(sim)
+            with phase("get_state"):
+                state_new = agent.get_state(sim)
             agent.n_games += 1
+            frames = frame_count
             frame_count = 0
-            agent.train_long_memory()
+            if learner is None:
+                with phase("train_long_memory"):
+                    agent.train_long_memory()
 
             if score > record:
                 record = score
                 if not skip_next_checkpoint_save:
-                    agent.save_checkpoint(
-                        f"{score:04}_checkpoint", plot_scores, plot_mean_scores
-                    )
+                    with phase("save_checkpoint"), paused():
+                        agent.save_checkpoint(score, plot_scores, plot_mean_scores)
                 skip_next_checkpoint_save = False
 
             print(f"Game {agent.n_games}, {score=}, {record=}, {total_reward=}")
 
+            with phase("metrics"):
+                plot_scores.append(score)
+                mean_score = metrics.log(score, total_reward, frames, agent.epsilon)
+                plot_mean_scores.append(mean_score)
+
             total_reward = 0
+            profiler.maybe_report()
 
-            plot_scores.append(score)
-            total_score += score
-            mean_score = total_score / agent.n_games
-            plot_mean_scores.append(mean_score)
-            plot(plot_scores, plot_mean_scores)
+            if (last_game is not None and agent.n_games >= last_game) or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                break
+
+        state_old = state_new
+
+    if learner is not None:
+        learner.close()
+    metrics.close()
+    agent.close()
 
 
-def play(width: int, height: int, fps: int, game_duration_frames: int) -> None:
+def train_vectorized(
+    width: int,
+    height: int,
+    fps: int,
+    game_duration_frames: int,
+    num_games: int,
+) -> None:
+    print(f"Setting up vectorized training with {num_games} games...")
+    record = 0
     agent = Agent()
-    checkpoint_filename = get_latest_checkpoint_filename()
+
+    plot_scores, plot_mean_scores, skip_next_checkpoint_save, metrics = (
+        resume_agent(agent)
+    )
+
+    games = VecGame(num_games, width, height, game_duration_frames)
+    states_old = games.reset()
+    dt = 1 / fps
+    total_rewards = np.zeros(num_games)
+    while True:
+        final_moves = agent.get_actions(states_old)
+        states_new, rewards, game_overs, scores = games.step(dt, final_moves)
+        total_rewards += rewards
+
+        agent.remember_batch(states_old, final_moves, rewards, states_new, game_overs)
+        states_old = states_new
+
+        if not game_overs.any():
+            continue
+
+        agent.train_long_memory()
+        for ix in np.flatnonzero(game_overs):
+            score = int(scores[ix])
+            agent.n_games += 1
+
+            if score > record:
+                record = score
+                if not skip_next_checkpoint_save:
+                    agent.save_checkpoint(score, plot_scores, plot_mean_scores)
+                skip_next_checkpoint_save = False
+
+            print(
+                f"Game {agent.n_games}, {score=}, {record=}, "
+                f"total_reward={total_rewards[ix]}"
+            )
+
+            plot_scores.append(score)
+            plot_mean_scores.append(
+                metrics.log(
+                    score, total_rewards[ix], game_duration_frames, agent.epsilon
+                )
+            )
+        total_rewards[game_overs] = 0
+
+
+def play(
+    width: int,
+    height: int,
+    fps: int,
+    game_duration_frames: int,
+    profiler: Profiler = NULL_PROFILER,
+    quantize: bool = False,
+    recorder: Optional[EpisodeRecorder] = None,
+    action_repeat: int = ACTION_REPEAT,
+    display_fps: int = DISPLAY_FPS,
+    speed: Optional[float] = 1.0,
+    threaded: bool = False,
+) -> None:
+    # Physics runs at fps simulated steps per second, times speed (None:
+    # as fast as possible), and is drawn at most display_fps times a second
+    from src.game.frame_loop import run_decoupled
+    from src.game.game import Game
+
+    agent = Agent()
+    checkpoint_filename = get_best_checkpoint_filename()
     if checkpoint_filename:
         agent.load_checkpoint(checkpoint_filename, train=False)
+    if quantize:
+        agent.quantize_policy()
 
     game = Game(
         width=width, height=height, fps=fps, game_duration_frames=game_duration_frames
     )
+    game.profiler = profiler
     game.reset_game()
+    sim = game.sim
     dt = 1 / fps
     frame_count = 0
-    while True:
-        state_old = agent.get_state(game)
-        final_move = agent.get_action(state_old)
-        _, game_over, score = game.play_step(dt, final_move)
+    total_reward = 0
+    phase = profiler.phase
+    if recorder is not None:
+        recorder.begin(sim)
+
+    def step() -> int:
+        nonlocal frame_count, total_reward
+        with phase("get_state"):
+            state = agent.get_state(sim)
+        with phase("get_action"):
+            final_move = agent.get_action(state)
+        repeat = min(action_repeat, game_duration_frames - frame_count)
+        with phase("play_step.physics"):
+            reward, _, score = sim.step_repeat(dt, final_move, repeat, recorder)
+        total_reward += reward
+        frame_count += repeat
 
         if frame_count >= game_duration_frames:
-            game_over = True
-
-        if game_over:
             print(f"Game over! {score=}")
-            game.reset_game()
+            count_game_events(profiler, sim)
+            if recorder is not None:
+                recorder.end(sim, dt, score, total_reward)
+            # The window stays open; only the simulation starts over
+            sim.reset()
+            if recorder is not None:
+                recorder.begin(sim)
             frame_count = 0
+            total_reward = 0
+            profiler.maybe_report()
+        return repeat
+
+    run_decoupled(game, step, display_fps, speed, threaded)
+    game.quit()
+
+
+def capture(
+    width: int,
+    height: int,
+    fps: int,
+    game_duration_frames: int,
+    path: str,
+    episodes: int = 1,
+    fmt: str = "raw",
+    downsample: int = 1,
+    greyscale: bool = False,
+    action_repeat: int = ACTION_REPEAT,
+) -> None:
+    """Play the best checkpoint offscreen and write CAPTURE_FPS frames
+    per simulated second to ``path``, as fast as the writer keeps up."""
+    from src.game.capture import FrameCapture, FrameWriter
+    from src.game.game import Game
 
-        frame_count += 1
-
+    agent = Agent()
+    checkpoint_filename = get_best_checkpoint_filename()
+    if checkpoint_filename:
+        agent.load_checkpoint(checkpoint_filename, train=False)
 
-def play_human(width: int, height: int, fps: int, game_duration_frames: int) -> None:
     game = Game(
-        width=width, height=height, fps=fps, game_duration_frames=game_duration_frames
+        width=width,
+        height=height,
+        fps=fps,
+        game_duration_frames=game_duration_frames,
+        offscreen=True,
     )
     game.reset_game()
+    sim = game.sim
+    frame_capture = FrameCapture(game, downsample, greyscale)
+    # An export should have every frame, so wait for the writer instead
+    # of dropping
+    writer = FrameWriter(
+        path,
+        frame_capture.shape,
+        CAPTURE_FPS,
+        fmt,
+        block=True,
+        channels=frame_capture.writer_channels,
+    )
+    every = max(1, round(fps / CAPTURE_FPS))
     dt = 1 / fps
-    frame_count = 0
-    while True:
-        final_move = game.parse_keys()
-        _, game_over, score = game.play_step(dt, final_move)
+    try:
+        for _ in range(episodes):
+            sim.reset()
+            frame_count = 0
+            while frame_count < game_duration_frames:
+                final_move = agent.get_action(agent.get_state(sim))
+                for _ in range(min(action_repeat, game_duration_frames - frame_count)):
+                    if frame_count % every == 0:
+                        game.draw()
+                        writer.submit(frame_capture.grab())
+                    sim.step(dt, final_move)
+                    frame_count += 1
+            print(f"Game over! score={sim.score}")
+    finally:
+        writer.close()
+    print(f"Wrote {writer.written} frames of {frame_capture.shape} to {path}")
+
+
+def count_game_events(profiler: Profiler, sim: Simulation) -> None:
+    # Read once per game from the simulation's own tallies, so the physics
+    # step never calls into the profiler
+    profiler.count("goals", sim.score)
+    profiler.count("kicks", sim.kicks)
+    profiler.count("wall_hits", sim.wall_hits)
+
+
+def resume_agent(agent: Agent) -> Tuple[List[int], List[float], bool, MetricsLog]:
+    """Load the latest checkpoint into ``agent``, if there is one.
+
+    Returns the score history, whether to skip the next checkpoint save
+    (it would repeat the one just loaded), and the metrics log.
+    """
+    plot_scores: List[int] = []
+    plot_mean_scores: List[float] = []
+    skip_next_checkpoint_save = False
+    checkpoint_filename = get_latest_checkpoint_filename()
+    if checkpoint_filename:
+        plot_scores, plot_mean_scores = agent.load_checkpoint(
+            checkpoint_filename, train=True
+        )
+        agent.n_games = len(plot_scores)
 
-        if frame_count >= game_duration_frames:
-            game_over = True
+        skip_next_checkpoint_save = True
+        print(f"Loaded state from from {checkpoint_filename}")
+    else:
+        print("No checkpoint file found. Starting from scratch")
+    metrics = MetricsLog(METRICS_PATH, plot_scores)
+    return plot_scores, plot_mean_scores, skip_next_checkpoint_save, metrics
 
-        if game_over:
-            print(f"Game over! {score=}")
-            game.reset_game()
-            frame_count = 0
 
-        frame_count += 1
+def get_latest_checkpoint_filename(directory: str = CHECKPOINT_DIRECTORY) -> str:
+    # The most recently written checkpoint, to resume training from
+    return CheckpointManager(directory).latest() or ""
 
 
-def get_latest_checkpoint_filename(directory: str = "checkpoints") -> str:
-    files = os.listdir(directory)
-    try:
-        latest_file = sorted(files)[-1]
-        return os.path.join(f"./{directory}", latest_file)
-    except IndexError:
-        return ""
+def get_best_checkpoint_filename(directory: str = CHECKPOINT_DIRECTORY) -> str:
+    return CheckpointManager(directory).best() or ""
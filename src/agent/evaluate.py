@@ -0,0 +1,233 @@
+"""Rank checkpoints by headless evaluation, dropping clear losers early.
+
+    python -m src.agent.evaluate                    # every indexed checkpoint
+    python -m src.agent.evaluate checkpoints/0007_checkpoint.tar ...
+    python -m src.agent.evaluate --max-episodes 400 --metric reward
+
+Every checkpoint plays the same episodes: episode ``i`` reseeds ``random``
+with ``seed + i`` before resetting, so start positions and post-goal
+placements are shared. Episodes run in rounds, spread over a process
+pool. After each round a checkpoint whose confidence interval lies wholly
+below the leader's is eliminated. The rest play on until one is left or
+they reach ``--max-episodes``; a lone checkpoint plays all of them. The
+ranking is printed and written to evaluation.csv next to the checkpoints.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import math
+import multiprocessing as mp
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import torch
+
+from src.agent.agent import ACTION_SIZE, ONE_HOT_ACTIONS, STATE_SIZE, Agent
+from src.checkpoints.manager import CheckpointManager, load_parts
+from src.model.inference import NumpyPolicy
+from src.model.model import Linear_QNet
+from src.simulation.simulation import Simulation
+
+WIDTH = HEIGHT = 400
+FPS = 60
+GAME_DURATION_FRAMES = 1500
+ROUND_EPISODES = 16
+MIN_EPISODES = 32  # before anything can be eliminated
+MAX_EPISODES = 256
+CONFIDENCE_Z = 1.96  # two-sided 95%
+METRICS = ("score", "reward")
+REPORT_NAME = "evaluation.csv"
+
+# Per worker process: checkpoint path -> policy, so each is loaded once
+POLICIES: Dict[str, NumpyPolicy] = {}
+
+
+@dataclass
+class Standing:
+    path: str
+    scores: List[int] = field(default_factory=list)
+    rewards: List[float] = field(default_factory=list)
+    eliminated_after: Optional[int] = None  # episodes played when dropped
+
+    def values(self, metric: str) -> np.ndarray:
+        return np.array(self.scores if metric == "score" else self.rewards, float)
+
+    def interval(self, metric: str) -> Tuple[float, float, float]:
+        """Mean and normal-approximation confidence bounds."""
+        values = self.values(metric)
+        mean = float(values.mean())
+        if len(values) < 2:
+            return mean, -math.inf, math.inf
+        half = CONFIDENCE_Z * float(values.std(ddof=1)) / math.sqrt(len(values))
+        return mean, mean - half, mean + half
+
+
+def load_policy(path: str) -> NumpyPolicy:
+    policy = POLICIES.get(path)
+    if policy is None:
+        # Only the weights; replay and optimizer state are not needed
+        weights = load_parts(path, ("model",))["model"]
+        # Sweeps may have trained other hidden sizes than the default
+        hidden1_size = weights["linear1.weight"].shape[0]
+        model = Linear_QNet(STATE_SIZE, hidden1_size, ACTION_SIZE)
+        model.load_state_dict(weights)
+        policy = NumpyPolicy(model.eval())
+        POLICIES[path] = policy
+    return policy
+
+
+def play_episodes(
+    path: str, first_episode: int, n_episodes: int, seed: int
+) -> List[Tuple[int, float]]:
+    torch.set_num_threads(1)
+    policy = load_policy(path)
+    sim = Simulation(WIDTH, HEIGHT, GAME_DURATION_FRAMES)
+    dt = 1 / FPS
+    results = []
+    for episode in range(first_episode, first_episode + n_episodes):
+        random.seed(seed + episode)
+        sim.reset()
+        total_reward = 0.0
+        for _ in range(GAME_DURATION_FRAMES):
+            move = ONE_HOT_ACTIONS[policy.act(Agent.get_state(sim))]
+            reward, _, _ = sim.step(dt, move)
+            total_reward += reward
+        results.append((sim.score, total_reward))
+    return results
+
+
+def tournament(
+    paths: List[str],
+    workers: int,
+    max_episodes: int = MAX_EPISODES,
+    metric: str = "score",
+    seed: int = 0,
+) -> List[Standing]:
+    standings = [Standing(path) for path in paths]
+    active = list(standings)
+    played = 0
+    with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+        while active and played < max_episodes:
+            n = min(ROUND_EPISODES, max_episodes - played)
+            # Split each checkpoint's round so small fields still use
+            # every worker
+            chunks = max(1, min(n, workers // len(active)))
+            sizes = [len(part) for part in np.array_split(np.arange(n), chunks)]
+            futures = []
+            for standing in active:
+                first = played
+                for size in sizes:
+                    futures.append(
+                        (
+                            standing,
+                            pool.submit(
+                                play_episodes, standing.path, first, size, seed
+                            ),
+                        )
+                    )
+                    first += size
+            for standing, future in futures:
+                for score, total_reward in future.result():
+                    standing.scores.append(score)
+                    standing.rewards.append(total_reward)
+            played += n
+
+            if played >= MIN_EPISODES and len(active) > 1:
+                intervals = {id(s): s.interval(metric) for s in active}
+                leader = max(active, key=lambda s: intervals[id(s)][0])
+                leader_low = intervals[id(leader)][1]
+                for standing in active:
+                    if intervals[id(standing)][2] < leader_low:
+                        standing.eliminated_after = played
+                active = [s for s in active if s.eliminated_after is None]
+            print(
+                f"{played} episodes: {len(active)} of {len(standings)} checkpoints "
+                f"still in contention"
+            )
+            if len(active) == 1 < len(standings):
+                break  # more episodes cannot change the ranking
+    # Survivors first, then the later a checkpoint was dropped the better
+    return sorted(
+        standings,
+        key=lambda s: (
+            s.eliminated_after is None,
+            s.eliminated_after or 0,
+            s.interval(metric)[0],
+        ),
+        reverse=True,
+    )
+
+
+def write_report(standings: List[Standing], metric: str, path: str) -> None:
+    header = (
+        "rank",
+        "checkpoint",
+        "episodes",
+        "mean",
+        "ci_low",
+        "ci_high",
+        "mean_score",
+        "mean_reward",
+        "eliminated_after",
+    )
+    rows = []
+    for rank, standing in enumerate(standings, 1):
+        mean, low, high = standing.interval(metric)
+        rows.append(
+            (
+                rank,
+                os.path.basename(standing.path),
+                len(standing.scores),
+                f"{mean:.3f}",
+                f"{low:.3f}",
+                f"{high:.3f}",
+                f"{np.mean(standing.scores):.3f}",
+                f"{np.mean(standing.rewards):.1f}",
+                standing.eliminated_after or "",
+            )
+        )
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+    width = max(len("checkpoint"), *(len(row[1]) for row in rows))
+    print(
+        f"{'rank':>4s} {'checkpoint':{width}s} {'episodes':>8s} "
+        f"{f'mean {metric}':>12s} {'95% CI':>17s} {'dropped':>8s}"
+    )
+    for rank, name, episodes, mean_text, low_text, high_text, _, _, dropped in rows:
+        print(
+            f"{rank:4d} {name:{width}s} {episodes:8d} {mean_text:>12s} "
+            f"{f'[{low_text}, {high_text}]':>17s} {dropped!s:>8s}"
+        )
+    print(f"Wrote {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("checkpoints", nargs="*", help="default: all in --directory")
+    parser.add_argument("-d", "--directory", default="checkpoints")
+    parser.add_argument("--max-episodes", type=int, default=MAX_EPISODES)
+    parser.add_argument("--metric", choices=METRICS, default="score")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    manager = CheckpointManager(args.directory)
+    paths = args.checkpoints or [manager.path(e.file) for e in manager.entries]
+    if not paths:
+        parser.error(f"no checkpoints in {args.directory}")
+    print(f"Evaluating {len(paths)} checkpoints on {args.workers} workers")
+    standings = tournament(
+        paths, args.workers, args.max_episodes, args.metric, args.seed
+    )
+    report_directory = os.path.dirname(paths[0]) or "."
+    write_report(standings, args.metric, os.path.join(report_directory, REPORT_NAME))
+
+
+if __name__ == "__main__":
+    main()
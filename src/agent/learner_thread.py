@@ -0,0 +1,159 @@
+"""Training on a background thread while the caller keeps playing.
+
+``LearnerThread`` runs ``QTrainer`` updates on the agent's model as long as
+it stays within ``update_to_data`` gradient steps per stored transition.
+A prefetch thread samples the next batches while the current one trains.
+Acting switches to a separate copy of the model, because the learner
+updates ``agent.model`` in place. Every ``publish_interval`` updates the
+learner publishes a snapshot of its weights. The caller copies the
+snapshot in with ``sync``, which compares a version number and takes no
+lock.
+
+The replay memory is shared, so ``remember`` and sampling take
+``memory_lock``. The model and optimizer are updated under ``model_lock``,
+which is also what checkpoint saving holds for a consistent snapshot.
+"""
+from __future__ import annotations
+import copy
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np
+import torch
+
+from src.agent.agent import BATCH_SIZE, GRADIENT_STEPS, Agent
+from src.agent.replay_memory import Batch, PrioritizedReplayMemory
+from src.model.inference import NumpyPolicy
+
+PREFETCH_BATCHES = 2
+PUBLISH_INTERVAL = 50  # learner updates between weight snapshots
+IDLE_SLEEP = 0.001  # seconds, when ahead of the update-to-data ratio
+
+# Batch, then importance weights and indices for prioritized memory
+Sample = Tuple[Batch, Optional[torch.Tensor], Optional[np.ndarray]]
+
+
+class LearnerThread(threading.Thread):
+    def __init__(
+        self,
+        agent: Agent,
+        update_to_data: float,
+        publish_interval: int = PUBLISH_INTERVAL,
+        prefetch: int = PREFETCH_BATCHES,
+    ) -> None:
+        super().__init__(name="learner", daemon=True)
+        self.agent = agent
+        self.update_to_data = update_to_data
+        self.publish_interval = publish_interval
+        self.memory_lock = threading.Lock()
+        self.model_lock = threading.Lock()
+        self.batches: queue.Queue[Sample] = queue.Queue(maxsize=prefetch)
+        self.stopping = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.n_transitions = 0
+        self.n_updates = 0
+
+        # Acting reads its own copy, refreshed from published snapshots
+        self.acting_model = copy.deepcopy(agent.model)
+        self.acting_model.requires_grad_(False)
+        agent.policy = NumpyPolicy(self.acting_model)
+        self.published: Tuple[int, Dict[str, torch.Tensor]] = (0, {})
+        self.acting_version = 0
+
+        self.prefetcher = threading.Thread(
+            target=self.prefetch, name="learner-prefetch", daemon=True
+        )
+
+    def remember(self, *transition: Any) -> None:
+        with self.memory_lock:
+            self.agent.remember(*transition)
+        self.n_transitions += 1
+
+    def sync(self) -> bool:
+        """Copy in the latest published weights, if they are new."""
+        if self.error is not None:
+            raise RuntimeError("Learner thread failed") from self.error
+        version, state = self.published
+        if version == self.acting_version:
+            return False
+        # In place, so the NumpyPolicy views stay valid
+        self.acting_model.load_state_dict(state)
+        self.acting_version = version
+        return True
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        # Between updates, e.g. to checkpoint a consistent model/optimizer
+        with self.model_lock:
+            yield
+
+    def start(self) -> None:
+        self.prefetcher.start()
+        super().start()
+
+    def close(self) -> None:
+        self.stopping.set()
+        self.join()
+        self.prefetcher.join()
+
+    def sample(self) -> Sample:
+        memory = self.agent.memory
+        with self.memory_lock:
+            if isinstance(memory, PrioritizedReplayMemory):
+                batch, weights, ixs = memory.sample_prioritized(BATCH_SIZE)
+                return batch, weights, ixs
+            return memory.sample(BATCH_SIZE), None, None
+
+    def prefetch(self) -> None:
+        while not self.stopping.is_set():
+            if len(self.agent.memory) == 0:
+                time.sleep(IDLE_SLEEP)
+                continue
+            sample = self.sample()
+            while not self.stopping.is_set():
+                try:
+                    self.batches.put(sample, timeout=IDLE_SLEEP)
+                    break
+                except queue.Full:
+                    pass
+
+    def run(self) -> None:
+        try:
+            self.train_continuously()
+        except BaseException as error:
+            self.error = error
+            self.stopping.set()
+
+    def train_continuously(self) -> None:
+        trainer = self.agent.trainer
+        memory = self.agent.memory
+        while not self.stopping.is_set():
+            if self.n_updates >= self.update_to_data * self.n_transitions:
+                time.sleep(IDLE_SLEEP)
+                continue
+            try:
+                batch, weights, ixs = self.batches.get(timeout=IDLE_SLEEP)
+            except queue.Empty:
+                continue
+
+            with self.model_lock:
+                trainer.train_step(*batch, n_steps=GRADIENT_STEPS, weights=weights)
+            if ixs is not None:
+                assert isinstance(memory, PrioritizedReplayMemory)
+                with self.memory_lock:
+                    memory.update_priorities(ixs, trainer.td_errors.numpy())
+            self.n_updates += 1
+
+            if self.n_updates % self.publish_interval == 0:
+                self.publish()
+
+    def publish(self) -> None:
+        # Fresh tensors, so the snapshot never changes after publishing
+        with self.model_lock:
+            state = {
+                key: value.detach().clone()
+                for key, value in self.agent.model.state_dict().items()
+            }
+        self.published = (self.published[0] + 1, state)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import torch
+from torch import Tensor
+
+from src.agent.sum_tree import SumTree
+
+Batch = Tuple[Tensor, Tensor, Tensor, Tensor, Tensor]
+
+
+class ReplayMemory:
+    """Fixed-capacity ring buffer of transitions in preallocated arrays.
+
+    Once full, new transitions overwrite the oldest ones, like a
+    ``deque(maxlen=capacity)``. Actions are stored as indices rather than
+    one-hot arrays.
+    """
+
+    def __init__(
+        self, capacity: int, state_size: int, seed: Optional[int] = None
+    ) -> None:
+        self.capacity = capacity
+        self.state_size = state_size
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.uint8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.game_overs = np.zeros(capacity, dtype=np.bool_)
+        self.index = 0
+        self.size = 0
+        self.total = 0  # transitions ever added, including overwritten ones
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(
+        self,
+        state: np.ndarray,
+        action: int,
+        reward: float,
+        next_state: np.ndarray,
+        game_over: bool,
+    ) -> None:
+        ix = self.index
+        self.states[ix] = state
+        self.actions[ix] = action
+        self.rewards[ix] = reward
+        self.next_states[ix] = next_state
+        self.game_overs[ix] = game_over
+        self.index = (ix + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.total += 1
+
+    def extend(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        game_overs: np.ndarray,
+    ) -> None:
+        n = len(states)
+        self.total += n
+        if n > self.capacity:
+            # Only the newest `capacity` transitions would survive anyway
+            states, actions, rewards, next_states, game_overs = (
+                arr[-self.capacity :]
+                for arr in (states, actions, rewards, next_states, game_overs)
+            )
+            n = self.capacity
+
+        ixs = (self.index + np.arange(n)) % self.capacity
+        self.states[ixs] = states
+        self.actions[ixs] = actions
+        self.rewards[ixs] = rewards
+        self.next_states[ixs] = next_states
+        self.game_overs[ixs] = game_overs
+        self.index = (self.index + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size: int) -> Batch:
+        """Sample a batch as tensors that share memory with NumPy arrays.
+
+        Indices are drawn uniformly with replacement. If the memory holds
+        no more than ``batch_size`` transitions, the whole memory is
+        returned as views with no copying at all.
+        """
+        if self.size <= batch_size:
+            ixs: Any = slice(0, self.size)
+        else:
+            ixs = self.rng.integers(0, self.size, size=batch_size)
+        return self.batch(ixs)
+
+    def batch(self, ixs: Any) -> Batch:
+        return (
+            torch.from_numpy(self.states[ixs]),
+            torch.from_numpy(self.actions[ixs]),
+            torch.from_numpy(self.rewards[ixs]),
+            torch.from_numpy(self.next_states[ixs]),
+            torch.from_numpy(self.game_overs[ixs]),
+        )
+
+    def latest(self, n: int) -> Dict[str, np.ndarray]:
+        """Copy of the newest ``n`` transitions, oldest first."""
+        n = min(n, self.size)
+        order = (self.index - n + np.arange(n)) % self.capacity
+        return {
+            "states": self.states[order],
+            "actions": self.actions[order],
+            "rewards": self.rewards[order],
+            "next_states": self.next_states[order],
+            "game_overs": self.game_overs[order],
+        }
+
+    def state_dict(self) -> Dict[str, Any]:
+        # Stored oldest first so that reloading into any capacity keeps
+        # the most recent transitions
+        return self.latest(self.size)
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self.index = 0
+        self.size = 0
+        self.total = 0
+        self.extend(
+            state_dict["states"],
+            state_dict["actions"],
+            state_dict["rewards"],
+            state_dict["next_states"],
+            state_dict["game_overs"],
+        )
+
+    def extend_from_tuples(self, transitions: Iterable[Tuple[Any, ...]]) -> None:
+        # For checkpoints saved when memory was a deque of one-hot tuples
+        for state, action, reward, next_state, game_over in transitions:
+            self.append(state, int(np.argmax(action)), reward, next_state, game_over)
+
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """Replay memory sampled in proportion to each transition's priority.
+
+    Priorities are ``(|TD error| + epsilon) ** alpha``, kept in a
+    ``SumTree`` indexed by ring position, so capacity and overwriting work
+    exactly as in ``ReplayMemory``. New transitions get the highest
+    priority seen so far, so each is likely to be replayed at least once.
+    Importance-sampling weights correct for the non-uniform sampling, with
+    ``beta`` annealed from ``beta_start`` to 1 over ``beta_steps`` samples.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        state_size: int,
+        seed: Optional[int] = None,
+        alpha: float = 0.6,
+        beta_start: float = 0.4,
+        beta_steps: int = 100_000,
+        epsilon: float = 1e-3,
+    ) -> None:
+        super().__init__(capacity, state_size, seed)
+        self.alpha = alpha
+        self.beta_start = beta_start
+        self.beta_steps = beta_steps
+        self.epsilon = epsilon
+        self.priorities = SumTree(capacity)
+        self.max_priority = 1.0
+        self.n_samples = 0
+        # Ring indices appended one at a time since the last sample; their
+        # priorities are written in one batch, as a tree walk per append
+        # would cost more than the rest of a training frame
+        self.pending: List[int] = []
+
+    @property
+    def beta(self) -> float:
+        progress = min(self.n_samples / self.beta_steps, 1.0)
+        return self.beta_start + (1.0 - self.beta_start) * progress
+
+    def append(
+        self,
+        state: np.ndarray,
+        action: int,
+        reward: float,
+        next_state: np.ndarray,
+        game_over: bool,
+    ) -> None:
+        self.pending.append(self.index)
+        super().append(state, action, reward, next_state, game_over)
+
+    def extend(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        game_overs: np.ndarray,
+    ) -> None:
+        n = min(len(states), self.capacity)
+        ixs = (self.index + np.arange(n)) % self.capacity
+        super().extend(states, actions, rewards, next_states, game_overs)
+        self.priorities.update(ixs, np.full(n, self.max_priority))
+
+    def sample_prioritized(self, batch_size: int) -> Tuple[Batch, Tensor, np.ndarray]:
+        """Sample a batch with its importance-sampling weights and indices.
+
+        One index is drawn from each of ``batch_size`` equal slices of the
+        total priority. Weights are normalised so the largest in the batch
+        is 1. Pass the indices back to ``update_priorities``.
+        """
+        self.flush_pending()
+        total = self.priorities.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        ixs = np.minimum(self.priorities.find(values), self.size - 1)
+
+        probabilities = self.priorities[ixs] / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.n_samples += batch_size
+        return (
+            self.batch(ixs),
+            torch.from_numpy(weights.astype(np.float32)),
+            ixs,
+        )
+
+    def flush_pending(self) -> None:
+        if self.pending:
+            ixs = np.array(self.pending)
+            self.priorities.update(ixs, np.full(len(ixs), self.max_priority))
+            self.pending.clear()
+
+    def update_priorities(self, ixs: np.ndarray, td_errors: np.ndarray) -> None:
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.priorities.update(ixs, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        # Priorities are not checkpointed; reloaded transitions start equal
+        self.priorities.clear()
+        self.pending.clear()
+        self.max_priority = 1.0
+        super().load_state_dict(state_dict)
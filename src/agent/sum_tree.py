@@ -0,0 +1,54 @@
+from __future__ import annotations
+import numpy as np
+
+
+class SumTree:
+    """Binary tree of non-negative priorities where each node is the sum of
+    its children, stored flat in one array (root at 1, leaves at the end).
+
+    Updating a leaf and finding the leaf for a prefix sum both walk one
+    root-to-leaf path, O(log n). The batched methods walk all paths of a
+    batch together, one NumPy operation per tree level.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.depth = max(int(np.ceil(np.log2(capacity))), 0)
+        self.n_leaves = 1 << self.depth
+        self.tree = np.zeros(2 * self.n_leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def __getitem__(self, ixs: np.ndarray) -> np.ndarray:
+        return self.tree[self.n_leaves + np.asarray(ixs)]
+
+    def update(self, ixs: np.ndarray, priorities: np.ndarray) -> None:
+        """Set the priorities of leaves ``ixs`` and refresh their ancestors.
+
+        With repeated indices, the last priority given wins.
+        """
+        tree = self.tree
+        nodes = self.n_leaves + np.asarray(ixs, dtype=np.int64)
+        tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            tree[nodes] = tree[2 * nodes] + tree[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index for each prefix sum in ``values`` (each in [0, total))."""
+        tree = self.tree
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            # Never step into an empty subtree, even when rounding leaves
+            # a value at or just past the total
+            go_right = (values >= tree[left]) & (tree[left + 1] > 0)
+            values -= tree[left] * go_right
+            nodes = left + go_right
+        return nodes - self.n_leaves
+
+    def clear(self) -> None:
+        self.tree[:] = 0.0
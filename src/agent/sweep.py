@@ -0,0 +1,300 @@
+"""Hyperparameter sweeps: many headless training runs in a process pool.
+
+    python -m src.agent.sweep space.json --minutes 20 --threads 1
+    python -m src.agent.sweep space.json --random 24 --minutes 30 -o sweeps/night
+
+The space is a JSON object from parameter name (see ``PARAMETERS``) to
+either a list of values or a distribution:
+
+    {"lr": [0.001, 0.0003], "gamma": {"uniform": [0.8, 0.99]},
+     "batch_size": {"int": [250, 2000]}, "kick_reward": [100, 500]}
+
+Distributions are "uniform", "log_uniform" and "int" (inclusive). Without
+``--random`` every combination of the listed values is run, so a grid
+may only contain lists. With ``--random N``, N configurations are drawn.
+
+Each job runs in its own directory under the output directory, which
+holds its params.json, train.log and the usual checkpoints/. Every job
+gets its own seed. When all jobs are done, results.csv has one row per
+job, and curves.csv has every job's mean score against wall time.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import math
+import multiprocessing as mp
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import torch
+
+from src.agent import agent as agent_module
+from src.agent.agent import train
+from src.components.ball import Ball
+from src.components.field import Field
+from src.components.goals import Goals
+
+WIDTH = HEIGHT = 400
+FPS = 60
+GAME_DURATION_FRAMES = 1500
+OUTPUT_DIRECTORY = "./sweeps"
+# Fractions of the time budget at which each job's mean score is reported
+CURVE_POINTS = (0.25, 0.5, 0.75, 1.0)
+
+# Sweepable name -> (object, attribute) it overrides in the job's process
+PARAMETERS: Dict[str, Tuple[Any, str]] = {
+    "lr": (agent_module, "LR"),
+    "batch_size": (agent_module, "BATCH_SIZE"),
+    "hidden1_size": (agent_module, "HIDDEN1_SIZE"),
+    "max_memory": (agent_module, "MAX_MEMORY"),
+    "gamma": (agent_module, "GAMMA"),
+    "gradient_steps": (agent_module, "GRADIENT_STEPS"),
+    "kick_reward": (Ball, "kick_reward"),
+    "wall_reward": (Field, "wall_reward"),
+    "goal_reward": (Goals, "goal_reward"),
+}
+INTEGER_PARAMETERS = {"batch_size", "hidden1_size", "max_memory", "gradient_steps"}
+
+Space = Dict[str, Any]
+
+
+@dataclass
+class Job:
+    job_id: int
+    params: Dict[str, Any]
+    seed: int
+    directory: str
+    max_seconds: float
+    max_games: Optional[int]
+    threads: int
+
+
+@dataclass
+class JobResult:
+    job: Job
+    games: int = 0
+    mean_score: float = 0.0
+    record: int = 0
+    wall_time: float = 0.0
+    # (wall time, mean score) after each game
+    curve: List[Tuple[float, float]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def mean_score_at(self, wall_time: float) -> float:
+        score = 0.0
+        for time_, mean_score in self.curve:
+            if time_ > wall_time:
+                break
+            score = mean_score
+        return score
+
+
+def grid(space: Space) -> List[Dict[str, Any]]:
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Grid search needs a list of values for {name!r}")
+    names = list(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+
+
+def draw(space: Space, n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {name: draw_value(name, spec, rng) for name, spec in space.items()}
+        for _ in range(n)
+    ]
+
+
+def draw_value(name: str, spec: Any, rng: random.Random) -> Any:
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    ((kind, (low, high)),) = spec.items()
+    if kind == "uniform":
+        value = rng.uniform(low, high)
+    elif kind == "log_uniform":
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    elif kind == "int":
+        return rng.randint(low, high)
+    else:
+        raise ValueError(f"Unknown distribution {kind!r} for {name!r}")
+    return round(value) if name in INTEGER_PARAMETERS else value
+
+
+def apply_params(params: Dict[str, Any]) -> None:
+    for name, value in params.items():
+        target, attribute = PARAMETERS[name]
+        setattr(target, attribute, value)
+
+
+def run_job(job: Job) -> JobResult:
+    # Runs in a pool process: the overrides and chdir only affect this job
+    torch.set_num_threads(job.threads)
+    os.makedirs(job.directory, exist_ok=True)
+    with open(os.path.join(job.directory, "params.json"), "w") as f:
+        json.dump({"params": job.params, "seed": job.seed}, f, indent=2)
+
+    result = JobResult(job)
+    start = time.monotonic()
+    try:
+        apply_params(job.params)
+        # Training reads and writes everything under ./checkpoints
+        os.chdir(job.directory)
+        os.makedirs("checkpoints", exist_ok=True)
+        with open("train.log", "w") as log, contextlib.redirect_stdout(log):
+            train(
+                WIDTH,
+                HEIGHT,
+                FPS,
+                GAME_DURATION_FRAMES,
+                seed=job.seed,
+                max_games=job.max_games,
+                max_seconds=job.max_seconds,
+            )
+    except Exception as error:
+        result.error = f"{type(error).__name__}: {error}"
+    result.wall_time = time.monotonic() - start
+    read_metrics(result, os.path.join(job.directory, agent_module.METRICS_PATH))
+    return result
+
+
+def read_metrics(result: JobResult, path: str) -> None:
+    if not os.path.isfile(path):
+        return
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            result.curve.append((float(row["wall_time"]), float(row["mean_score"])))
+            result.games = int(row["game"])
+            result.mean_score = float(row["mean_score"])
+            result.record = int(row["record"])
+
+
+def make_jobs(
+    configs: List[Dict[str, Any]],
+    output: str,
+    max_seconds: float,
+    max_games: Optional[int],
+    threads: int,
+    seed: int,
+) -> List[Job]:
+    return [
+        Job(
+            job_id,
+            params,
+            seed + job_id,
+            os.path.abspath(os.path.join(output, f"job_{job_id:03d}")),
+            max_seconds,
+            max_games,
+            threads,
+        )
+        for job_id, params in enumerate(configs)
+    ]
+
+
+def run_sweep(jobs: List[Job], workers: int) -> List[JobResult]:
+    results = []
+    # A fresh spawned process per job, so no job inherits another's
+    # overrides, working directory or torch state
+    with ProcessPoolExecutor(
+        workers, mp_context=mp.get_context("spawn"), max_tasks_per_child=1
+    ) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = result.error or f"mean score {result.mean_score:.2f}"
+            print(
+                f"[{len(results)}/{len(jobs)}] job {result.job.job_id} "
+                f"{result.job.params}: {result.games} games, {status}"
+            )
+    return sorted(results, key=lambda result: result.mean_score, reverse=True)
+
+
+def write_results(results: List[JobResult], names: List[str], output: str) -> None:
+    budget = max((result.job.max_seconds for result in results), default=0.0)
+    points = [fraction * budget for fraction in CURVE_POINTS]
+    with open(os.path.join(output, "results.csv"), "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(
+            ["job", "seed", *names, "games", "mean_score", "record", "wall_time"]
+            + [f"mean_score@{point:.0f}s" for point in points]
+            + ["error"]
+        )
+        for result in results:
+            writer.writerow(
+                [result.job.job_id, result.job.seed]
+                + [result.job.params.get(name) for name in names]
+                + [result.games, result.mean_score, result.record]
+                + [f"{result.wall_time:.1f}"]
+                + [result.mean_score_at(point) for point in points]
+                + [result.error or ""]
+            )
+    with open(os.path.join(output, "curves.csv"), "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["job", "wall_time", "mean_score"])
+        for result in results:
+            for wall_time, mean_score in result.curve:
+                writer.writerow([result.job.job_id, wall_time, mean_score])
+
+    print(
+        f"{'job':>4s} "
+        + " ".join(f"{name:>12s}" for name in names)
+        + f" {'games':>6s} "
+        + " ".join(f"{f'@{point:.0f}s':>7s}" for point in points)
+        + f" {'record':>6s}"
+    )
+    for result in results:
+        print(
+            f"{result.job.job_id:4d} "
+            + " ".join(f"{result.job.params.get(name)!s:>12.12s}" for name in names)
+            + f" {result.games:6d} "
+            + " ".join(f"{result.mean_score_at(point):7.2f}" for point in points)
+            + f" {result.record:6d}"
+            + (f"  {result.error}" if result.error else "")
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("space", help="JSON file describing the search space")
+    parser.add_argument("--random", type=int, help="draw N random configurations")
+    parser.add_argument("--minutes", type=float, default=10.0, help="per job")
+    parser.add_argument("--games", type=int, help="also stop jobs after N games")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads/job")
+    parser.add_argument("--workers", type=int, help="default: cores / threads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.space) as f:
+        space: Space = json.load(f)
+    unknown = set(space) - set(PARAMETERS)
+    if unknown:
+        parser.error(f"unknown parameters {sorted(unknown)}; known: {list(PARAMETERS)}")
+
+    if args.random is None:
+        configs = grid(space)
+    else:
+        configs = draw(space, args.random, random.Random(args.seed))
+    output = args.output or os.path.join(
+        OUTPUT_DIRECTORY, time.strftime("%Y%m%d-%H%M%S")
+    )
+    os.makedirs(output, exist_ok=True)
+    workers = args.workers or max(1, (os.cpu_count() or 1) // args.threads)
+    jobs = make_jobs(
+        configs, output, args.minutes * 60, args.games, args.threads, args.seed
+    )
+    print(f"Running {len(jobs)} jobs on {min(workers, len(jobs))} workers in {output}")
+    results = run_sweep(jobs, min(workers, len(jobs)))
+    write_results(results, list(space), output)
+
+
+if __name__ == "__main__":
+    main()
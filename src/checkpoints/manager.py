@@ -0,0 +1,187 @@
+from __future__ import annotations
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import torch
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+KEEP_TOP = 5  # best-scoring checkpoints kept
+KEEP_LAST = 3  # most recently written checkpoints kept
+CHECKPOINT_SUFFIX = "_checkpoint.tar"
+# Parts of a checkpoint file, as accepted by load_parts
+PARTS = ("model", "optimizer", "memory", "history")
+LEADING_SCORE = re.compile(r"^(\d+)_")
+# torch.load gained mmap in 2.1; older versions pass it on to the unpickler
+TORCH_LOAD_MMAP = "mmap" in inspect.signature(torch.load).parameters
+
+
+@dataclass
+class CheckpointEntry:
+    file: str  # name within the directory
+    score: int
+    games: int
+    timestamp: float
+    size: int  # bytes
+
+
+class CheckpointManager:
+    """Index of the checkpoints in one directory, with retention.
+
+    The index file lists every checkpoint with its score, game count,
+    write time and size, so ``best`` and ``latest`` never list the
+    directory or open a checkpoint. ``add`` is called once a checkpoint
+    is on disk. It then deletes every file that is neither among the
+    ``keep_top`` best scores nor the ``keep_last`` newest. A directory
+    without an index, from before there was one, is indexed once from
+    file names and sizes.
+    """
+
+    def __init__(
+        self,
+        directory: str = "checkpoints",
+        keep_top: int = KEEP_TOP,
+        keep_last: int = KEEP_LAST,
+    ) -> None:
+        self.directory = directory
+        self.keep_top = keep_top
+        self.keep_last = keep_last
+        # add runs on the checkpoint writer thread
+        self.lock = threading.Lock()
+        self.entries: List[CheckpointEntry] = []
+
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.isfile(index_path):
+            with open(index_path) as f:
+                index = json.load(f)
+            self.entries = [CheckpointEntry(**entry) for entry in index["entries"]]
+        elif os.path.isdir(directory):
+            self.entries = self.scan()
+            if self.entries:
+                self.write_index()
+
+    def path(self, file: str) -> str:
+        return os.path.join(self.directory, file)
+
+    def scan(self) -> List[CheckpointEntry]:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CHECKPOINT_SUFFIX):
+                continue
+            match = LEADING_SCORE.match(name)
+            stat = os.stat(self.path(name))
+            entries.append(
+                CheckpointEntry(
+                    name,
+                    score=int(match.group(1)) if match else 0,
+                    games=0,  # unknown without unpickling the file
+                    timestamp=stat.st_mtime,
+                    size=stat.st_size,
+                )
+            )
+        # Oldest first, as add keeps them; names break mtime ties
+        return sorted(entries, key=lambda entry: (entry.timestamp, entry.file))
+
+    def add(self, file_path: str, score: int, games: int) -> List[str]:
+        """Index a newly written checkpoint and apply the retention policy.
+
+        Returns the names of the files evicted.
+        """
+        name = os.path.basename(file_path)
+        entry = CheckpointEntry(
+            name, score, games, time.time(), os.path.getsize(file_path)
+        )
+        with self.lock:
+            self.entries = [e for e in self.entries if e.file != name]
+            self.entries.append(entry)
+            evicted = self.retain()
+            self.write_index()
+        for file in evicted:
+            try:
+                os.remove(self.path(file))
+            except FileNotFoundError:
+                pass
+        return evicted
+
+    def retain(self) -> List[str]:
+        by_score = sorted(
+            self.entries, key=lambda e: (e.score, e.timestamp), reverse=True
+        )
+        keep = {e.file for e in by_score[: self.keep_top]}
+        if self.keep_last:  # entries[-0:] would be every entry
+            keep.update(e.file for e in self.entries[-self.keep_last :])
+        evicted = [e.file for e in self.entries if e.file not in keep]
+        self.entries = [e for e in self.entries if e.file in keep]
+        return evicted
+
+    def write_index(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "entries": [asdict(entry) for entry in self.entries],
+                },
+                f,
+                indent=1,
+            )
+        os.replace(tmp_path, index_path)
+
+    def best(self) -> Optional[str]:
+        with self.lock:
+            if not self.entries:
+                return None
+            entry = max(self.entries, key=lambda e: (e.score, e.timestamp))
+        return self.path(entry.file)
+
+    def latest(self) -> Optional[str]:
+        with self.lock:
+            if not self.entries:
+                return None
+            return self.path(self.entries[-1].file)
+
+
+def load_parts(path: str, parts: Iterable[str] = PARTS) -> Dict[str, Any]:
+    """Only the requested parts of a checkpoint.
+
+    Where torch supports it, the file is memory-mapped, so tensors of
+    parts that are not asked for are never read from disk. "memory" is
+    the replay memory, or for files saved since the replay store,
+    ``replay_total``. "history" is ``scores`` and ``mean_scores``.
+    """
+    parts = set(parts)
+    unknown = parts - set(PARTS)
+    if unknown:
+        raise ValueError(f"Unknown checkpoint parts {sorted(unknown)}")
+    checkpoint = None
+    if TORCH_LOAD_MMAP:
+        try:
+            checkpoint = torch.load(
+                path, map_location="cpu", weights_only=False, mmap=True
+            )
+        except RuntimeError:
+            # Files in the legacy (non-zip) format cannot be memory-mapped
+            pass
+    if checkpoint is None:
+        checkpoint = torch.load(path, map_location="cpu", weights_only=False)
+
+    loaded: Dict[str, Any] = {}
+    if "model" in parts:
+        loaded["model"] = checkpoint["model"]
+    if "optimizer" in parts:
+        loaded["optimizer"] = checkpoint["optimizer"]
+    if "memory" in parts:
+        for key in ("memory", "replay_total"):
+            if key in checkpoint:
+                loaded[key] = checkpoint[key]
+    if "history" in parts:
+        loaded["scores"] = checkpoint["scores"]
+        loaded["mean_scores"] = checkpoint["mean_scores"]
+    return loaded
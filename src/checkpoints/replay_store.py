@@ -0,0 +1,144 @@
+from __future__ import annotations
+import json
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from src.agent.replay_memory import ReplayMemory
+
+# name, dtype, whether each row holds a whole state
+FIELDS: Tuple[Tuple[str, type, bool], ...] = (
+    ("states", np.float32, True),
+    ("actions", np.uint8, False),
+    ("rewards", np.float32, False),
+    ("next_states", np.float32, True),
+    ("game_overs", np.bool_, False),
+)
+META_FILE = "meta.json"
+
+
+class ReplayStore:
+    """Append-only on-disk replay data, one raw array file per field.
+
+    Each save appends only the transitions added to the memory since the
+    previous save. Loading memory-maps the files, so nothing is unpickled.
+    ``offset`` counts transitions dropped from the front by compaction.
+    The store keeps global indices so that a checkpoint's ``replay_total``
+    still points at the right rows afterwards.
+    """
+
+    def __init__(self, directory: str, state_size: int, max_size: int) -> None:
+        self.directory = directory
+        self.state_size = state_size
+        self.max_size = max_size
+        self.offset = 0
+        self.count = 0
+
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.isfile(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.offset = meta["offset"]
+            self.count = meta["count"]
+
+        # Global index reached once every snapshot taken so far is written
+        self.snapshot_total = self.total
+
+    @property
+    def total(self) -> int:
+        return self.offset + self.count
+
+    def append(self, memory: ReplayMemory) -> int:
+        """Write transitions added since the last append; returns how many."""
+        arrays, start = self.snapshot(memory)
+        self.write(arrays, start)
+        return len(arrays["states"])
+
+    def snapshot(self, memory: ReplayMemory) -> Tuple[Dict[str, np.ndarray], int]:
+        """Copy the transitions not yet handed to the store.
+
+        Returns the rows and the global index of the first one. This is
+        cheap and can run on the training thread, with ``write`` later
+        on another.
+        """
+        new = memory.total - self.snapshot_total
+        if new < 0 or new > len(memory):
+            # Either memory wrapped since the last save, so the rows in
+            # between are gone, or the store holds rows from a different
+            # run; restart the store from what memory holds
+            new = len(memory)
+        self.snapshot_total = memory.total
+        return memory.latest(new), memory.total - new
+
+    def write(self, arrays: Dict[str, np.ndarray], start: int) -> None:
+        n = len(arrays["states"])
+        if start != self.total:
+            self.rewrite(arrays, start)
+            return
+        if n == 0:
+            return
+
+        for name, dtype, is_state in FIELDS:
+            with open(self.path(name), "ab") as f:
+                # Drop anything written after the last committed meta
+                f.truncate(self.count * self.row_bytes(dtype, is_state))
+                f.write(arrays[name].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.count += n
+
+        if self.count > 2 * self.max_size:
+            self.rewrite(self.load(), self.total - self.max_size)
+        else:
+            self.write_meta()
+
+    def load(self, total: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Memory-map the newest ``max_size`` rows up to global index ``total``."""
+        total = self.total if total is None else min(total, self.total)
+        stop = max(total - self.offset, 0)
+        start = max(stop - self.max_size, 0)
+
+        arrays = {}
+        for name, dtype, is_state in FIELDS:
+            shape = (self.count, self.state_size) if is_state else (self.count,)
+            if self.count == 0:
+                array: np.ndarray = np.zeros(shape, dtype=dtype)
+            else:
+                array = np.memmap(self.path(name), dtype=dtype, mode="r", shape=shape)
+            arrays[name] = array[start:stop]
+        return arrays
+
+    def rewrite(self, arrays: Dict[str, np.ndarray], offset: int) -> None:
+        for name, _, _ in FIELDS:
+            tmp_path = self.path(name) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(np.ascontiguousarray(arrays[name]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path(name))
+        self.offset = offset
+        self.count = len(arrays["states"])
+        self.write_meta()
+
+    def write_meta(self) -> None:
+        meta_path = os.path.join(self.directory, META_FILE)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "offset": self.offset,
+                    "count": self.count,
+                    "state_size": self.state_size,
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def row_bytes(self, dtype: type, is_state: bool) -> int:
+        return np.dtype(dtype).itemsize * (self.state_size if is_state else 1)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+import atexit
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import numpy as np
+import torch
+
+from src.checkpoints.manager import CheckpointManager
+from src.checkpoints.replay_store import FIELDS, ReplayStore
+
+
+@dataclass
+class CheckpointJob:
+    file_path: str
+    checkpoint: Dict[str, Any]
+    replay: Dict[str, np.ndarray]
+    replay_start: int
+    # For the checkpoint index
+    score: int = 0
+    games: int = 0
+
+    def merge(self, newer: CheckpointJob) -> CheckpointJob:
+        # Only the newest checkpoint file is written, but every replay row
+        # still has to reach the store
+        end = self.replay_start + len(self.replay["states"])
+        if newer.replay_start != end:
+            # The newer snapshot restarts the store, so it supersedes ours
+            return newer
+        replay = {
+            name: np.concatenate([self.replay[name], newer.replay[name]])
+            for name, _, _ in FIELDS
+        }
+        return CheckpointJob(
+            newer.file_path,
+            newer.checkpoint,
+            replay,
+            self.replay_start,
+            newer.score,
+            newer.games,
+        )
+
+
+class CheckpointWriter:
+    """Serialises checkpoints on a background thread.
+
+    ``submit`` takes an already snapshotted job and returns immediately
+    unless ``max_pending`` jobs are already queued. Jobs that queue up
+    while a write is in progress are coalesced into one. Checkpoint files
+    are written to a temporary name, fsynced and renamed into place, then
+    added to ``manager``'s index if there is one. ``close`` (also run at
+    interpreter exit) flushes everything pending.
+    """
+
+    def __init__(
+        self,
+        replay_store: ReplayStore,
+        max_pending: int = 2,
+        manager: Optional[CheckpointManager] = None,
+    ) -> None:
+        self.replay_store = replay_store
+        self.manager = manager
+        self.jobs: queue.Queue[Optional[CheckpointJob]] = queue.Queue(max_pending)
+        self.error: Optional[BaseException] = None
+        self.closed = False
+        self.thread = threading.Thread(
+            target=self.run, name="checkpoint-writer", daemon=True
+        )
+        self.thread.start()
+        atexit.register(self.close)
+
+    def submit(self, job: CheckpointJob) -> None:
+        self.raise_error()
+        self.jobs.put(job)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.jobs.put(None)
+        self.thread.join()
+        atexit.unregister(self.close)
+        self.raise_error()
+
+    def raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError("Background checkpoint write failed") from error
+
+    def run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+
+            # Coalesce whatever else is already waiting
+            stop = False
+            while True:
+                try:
+                    newer = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    stop = True
+                    break
+                job = job.merge(newer)
+
+            try:
+                self.write(job)
+            except BaseException as error:  # surfaced on the next submit/close
+                self.error = error
+
+            if stop:
+                return
+
+    def write(self, job: CheckpointJob) -> None:
+        self.replay_store.write(job.replay, job.replay_start)
+
+        tmp_path = job.file_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            torch.save(job.checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, job.file_path)
+        if self.manager is not None:
+            self.manager.add(job.file_path, job.score, job.games)
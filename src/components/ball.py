@@ -1,27 +1,21 @@
-from typing import Tuple
-from pygame import Surface, Vector2
-
 from ..enums.direction import Direction
-from .shape import Shape
+from .shape import Bounds, Edge, Point, Shape
 from .player import Player
 
 
-Edge = Tuple[Vector2, Vector2]
-
-
 class Ball:
+    __slots__ = ("shape",)
+
     color = "red"
     radius = 10.0
+    kick_reward = 500
 
-    def __init__(self, screen: Surface, pos: Vector2) -> None:
-        self.shape = Shape(screen, pos, self.radius, self.color)
+    def __init__(self, pos: Point) -> None:
+        self.shape = Shape(pos, self.radius, self.color)
 
     def accelerate(self, direction: Direction) -> None:
         self.shape.accelerate(direction)
 
-    def draw(self) -> None:
-        self.shape.draw()
-
     def update(self, dt: float) -> None:
         self.shape.update(dt)
 
@@ -30,11 +24,14 @@ class Ball:
             reward = 0
         else:
             self.shape.kick(agent.shape)
-            reward = 500
+            reward = self.kick_reward
         return reward
 
-    def is_colliding_with(self, edge: Edge, on_side: Vector2) -> bool:
+    def is_colliding_with(self, edge: Edge, on_side: Point) -> bool:
         return self.shape.is_colliding_with(edge, on_side)
 
-    def snap_to(self, edge: Edge, on_side: Vector2) -> None:
+    def snap_to(self, edge: Edge, on_side: Point) -> None:
         self.shape.snap_to(edge, on_side)
+
+    def is_inside(self, bounds: Bounds) -> bool:
+        return self.shape.is_inside(bounds)
@@ -1,55 +1,50 @@
-import pygame
-from pygame import Vector2, Surface
-from typing import List
+from typing import Sequence
 
 from ..protocols.snappable import Snappable
+from .shape import Point
 
 
 class Field:
-    def __init__(self, screen: Surface, pos: Vector2, width: float, height: float):
-        self.screen = screen
+    __slots__ = ("pos", "width", "height", "center", "corners", "edges", "bounds")
+
+    wall_reward = -5
+
+    def __init__(self, pos: Point, width: float, height: float):
         self.pos = pos
         self.width = width
         self.height = height
-        self.corners = [
-            Vector2(self.pos.x, self.pos.y),
-            Vector2(self.pos.x + self.width, self.pos.y),
-            Vector2(self.pos.x + self.width, self.pos.y + self.height),
-            Vector2(self.pos.x, self.pos.y + self.height),
-        ]
-        self.edges = [
+        x, y = pos
+        # Boundary data is fixed for the life of the field, so build it once
+        self.center = (x + width / 2, y + height / 2)
+        self.corners = (
+            (x, y),
+            (x + width, y),
+            (x + width, y + height),
+            (x, y + height),
+        )
+        self.edges = (
             (self.corners[0], self.corners[1]),
             (self.corners[1], self.corners[2]),
             (self.corners[2], self.corners[3]),
             (self.corners[3], self.corners[0]),
-        ]
-
-    def draw(self) -> None:
-        pygame.draw.lines(self.screen, color="white", closed=True, points=self.corners)
+        )
+        self.bounds = (x, y, x + width, y + height)
 
-    def resolve_collisions(self, shapes: List[Snappable]) -> int:
+    def resolve_collisions(self, shapes: Sequence[Snappable]) -> int:
         reward = 0
         for shape in shapes:
             reward += self.snap_to_colliding_boundary(shape)
         return reward
 
     def snap_to_colliding_boundary(self, shape: Snappable) -> int:
+        # Exact complement of every edge test, so shapes well inside the
+        # field skip the per-edge checks
+        if shape.is_inside(self.bounds):
+            return 0
         reward = 0
-        center = Vector2(self.pos.x + self.width / 2, self.pos.y + self.height / 2)
-        corners = [
-            Vector2(self.pos.x, self.pos.y),
-            Vector2(self.pos.x + self.width, self.pos.y),
-            Vector2(self.pos.x + self.width, self.pos.y + self.height),
-            Vector2(self.pos.x, self.pos.y + self.height),
-        ]
-        edges = [
-            (corners[0], corners[1]),
-            (corners[1], corners[2]),
-            (corners[2], corners[3]),
-            (corners[3], corners[0]),
-        ]
-        for edge in edges:
+        center = self.center
+        for edge in self.edges:
             if shape.is_colliding_with(edge, on_side=center):
                 shape.snap_to(edge=edge, on_side=center)
-                reward -= 5
+                reward += self.wall_reward
         return reward
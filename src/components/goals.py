@@ -1,51 +1,41 @@
-import pygame
-from pygame import Vector2, Surface
-
 from .ball import Ball
+from .shape import Point
 
 
 class Goals:
+    __slots__ = ("left_pos", "right_pos", "post_dx", "post_dy")
+
     post_radius = 5.0
+    goal_reward = 100
 
-    def __init__(self, screen: Surface, left_pos: Vector2, right_pos: Vector2) -> None:
-        self.screen = screen
+    def __init__(self, left_pos: Point, right_pos: Point) -> None:
         self.left_pos = left_pos
         self.right_pos = right_pos
-
-    def draw(self) -> None:
-        pygame.draw.circle(
-            self.screen, color="white", center=self.left_pos, radius=self.post_radius
-        )
-        pygame.draw.circle(
-            self.screen, color="white", center=self.right_pos, radius=self.post_radius
-        )
+        self.post_dx = right_pos[0] - left_pos[0]
+        self.post_dy = right_pos[1] - left_pos[1]
 
     def check_goal(self, ball: Ball, dt: float) -> bool:
         # Check if path taken by ball intersects goal line
         # Using cross product solution provided by
         # https://stackoverflow.com/questions/563198/how-do-you-detect-where-two-line-segments-intersect
         # @gareth-rees
+        shape = ball.shape
 
-        if ball.shape.vel.magnitude() == 0.0:
+        if shape.vx == 0.0 and shape.vy == 0.0:
             return False
 
-        post_diff = self.right_pos - self.left_pos
         # ball_pos_old = ball.shape.pos - ball.shape.vel * dt
         # ball_trail = - ball.shape.pos + ball_pos_old
-        ball_trail = -1 * ball.shape.vel * 5 * dt
-        ball_pos_ghost = ball.shape.pos + ball_trail
+        trail_x = -5 * dt * shape.vx
+        trail_y = -5 * dt * shape.vy
 
-        try:
-            t = (ball.shape.pos - self.left_pos).cross(ball_trail) / (
-                post_diff.cross(ball_trail)
-            )
-
-            u = (ball.shape.pos - self.left_pos).cross(post_diff) / (
-                post_diff.cross(ball_trail)
-            )
+        denominator = self.post_dx * trail_y - self.post_dy * trail_x
+        if denominator == 0.0:
+            return False
 
-            pygame.draw.line(self.screen, "black", ball.shape.pos, ball_pos_ghost)
-            return 0 <= t <= 1 and 0 <= u <= 1
+        rel_x = shape.x - self.left_pos[0]
+        rel_y = shape.y - self.left_pos[1]
+        t = (rel_x * trail_y - rel_y * trail_x) / denominator
+        u = (rel_x * self.post_dy - rel_y * self.post_dx) / denominator
 
-        except ZeroDivisionError:
-            return False
+        return 0 <= t <= 1 and 0 <= u <= 1
@@ -1,31 +1,29 @@
-from typing import Tuple
-from pygame import Surface, Vector2
+from typing import Optional
 
 from ..enums.direction import Direction
-from .shape import Shape
-
-
-Edge = Tuple[Vector2, Vector2]
+from .shape import Bounds, Edge, Point, Shape
 
 
 class Player:
+    __slots__ = ("shape",)
+
     color = "blue"
     radius = 40.0
 
-    def __init__(self, screen: Surface, pos: Vector2) -> None:
-        self.shape = Shape(screen, pos, self.radius, self.color)
+    def __init__(self, pos: Point, color: Optional[str] = None) -> None:
+        self.shape = Shape(pos, self.radius, color or self.color)
 
     def accelerate(self, direction: Direction) -> None:
         self.shape.accelerate(direction)
 
-    def draw(self) -> None:
-        self.shape.draw()
-
     def update(self, dt: float) -> None:
         self.shape.update(dt)
 
-    def is_colliding_with(self, edge: Edge, on_side: Vector2) -> bool:
+    def is_colliding_with(self, edge: Edge, on_side: Point) -> bool:
         return self.shape.is_colliding_with(edge, on_side)
 
-    def snap_to(self, edge: Edge, on_side: Vector2) -> None:
+    def snap_to(self, edge: Edge, on_side: Point) -> None:
         self.shape.snap_to(edge, on_side)
+
+    def is_inside(self, bounds: Bounds) -> bool:
+        return self.shape.is_inside(bounds)
@@ -1,124 +1,143 @@
 from __future__ import annotations
 from typing import Tuple
-import pygame
-from pygame import Surface, Vector2
+import math
 
 from ..enums.direction import Direction
 
-Edge = Tuple[Vector2, Vector2]
+Point = Tuple[float, float]
+Edge = Tuple[Point, Point]
+Bounds = Tuple[float, float, float, float]  # left, top, right, bottom
 
 
 class Shape:
+    __slots__ = ("x", "y", "vx", "vy", "radius", "mass", "color")
+
     drag_coefficient = 0.0001
     acceleration = 10.0
 
-    def __init__(
-        self, screen: Surface, pos: Vector2, radius: float, color: str
-    ) -> None:
-        self.screen = screen
-        self.pos = pos
-        self.vel = Vector2(0.0, 0.0)
+    def __init__(self, pos: Point, radius: float, color: str) -> None:
+        self.x, self.y = pos
+        self.vx = 0.0
+        self.vy = 0.0
         self.radius = radius
+        self.mass = radius**2 * 3.14159
         self.color = color
 
-    def draw(self) -> None:
-        pygame.draw.circle(
-            self.screen,
-            color=self.color,
-            center=self.pos,
-            radius=self.radius,
-        )
+    @property
+    def pos(self) -> Point:
+        return (self.x, self.y)
+
+    def place(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
+        self.vx = 0.0
+        self.vy = 0.0
 
     def accelerate(self, direction: Direction) -> None:
         match direction:
             case Direction.UP:
-                self.vel.y -= self.acceleration
+                self.vy -= self.acceleration
             case Direction.DOWN:
-                self.vel.y += self.acceleration
+                self.vy += self.acceleration
             case Direction.LEFT:
-                self.vel.x -= self.acceleration
+                self.vx -= self.acceleration
             case Direction.RIGHT:
-                self.vel.x += self.acceleration
+                self.vx += self.acceleration
             case _:
                 pass
 
     def update(self, dt: float) -> None:
-        self.pos += self.vel * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
         self.add_resistance()
 
     def add_resistance(self) -> None:
-        self.vel -= self.drag_coefficient * self.vel.magnitude() * self.vel
+        drag = self.drag_coefficient * math.hypot(self.vx, self.vy)
+        self.vx -= drag * self.vx
+        self.vy -= drag * self.vy
 
     def overlaps(self, other: Shape) -> bool:
-        distance_vec = other.pos - self.pos
-        return distance_vec.magnitude() < other.radius + self.radius
+        dx = other.x - self.x
+        dy = other.y - self.y
+        reach = other.radius + self.radius
+        return dx * dx + dy * dy < reach * reach
+
+    def is_approaching(self, other: Shape) -> bool:
+        dx = other.x - self.x
+        dy = other.y - self.y
+        return (other.vx - self.vx) * dx + (other.vy - self.vy) * dy < 0
 
     def kick(self, other: Shape) -> None:
-        mass = self.radius**2 * 3.14159
-        mass_other = other.radius**2 * 3.14159
-        vel_diff = self.vel - other.vel
-        pos_diff = self.pos - other.pos
+        pos_diff_x = self.x - other.x
+        pos_diff_y = self.y - other.y
 
         # Equations for 2D elasitc collision
         # https://en.wikipedia.org/wiki/Elastic_collision
-        self.vel -= (
-            2
-            * mass_other
-            / (mass + mass_other)
-            * vel_diff.dot(pos_diff)
-            / pos_diff.magnitude_squared()
-            * pos_diff
-        )
-        other.vel -= (
-            2
-            * mass
-            / (mass + mass_other)
-            * -vel_diff.dot(-pos_diff)
-            / pos_diff.magnitude_squared()
-            * -pos_diff
-        )
-
-    def is_colliding_with(self, edge: Edge, on_side: Vector2) -> bool:
+        impulse = (
+            (self.vx - other.vx) * pos_diff_x + (self.vy - other.vy) * pos_diff_y
+        ) / (pos_diff_x * pos_diff_x + pos_diff_y * pos_diff_y)
+        total_mass = self.mass + other.mass
+        factor = 2 * other.mass / total_mass * impulse
+        factor_other = 2 * self.mass / total_mass * impulse
+
+        self.vx -= factor * pos_diff_x
+        self.vy -= factor * pos_diff_y
+        other.vx += factor_other * pos_diff_x
+        other.vy += factor_other * pos_diff_y
+
+    def is_colliding_with(self, edge: Edge, on_side: Point) -> bool:
         # check vertical:
         point1 = edge[0]
         if self.is_vertical(edge):
             # handle vertical line
-            if on_side.x < point1.x:
+            if on_side[0] < point1[0]:
                 # handle right boundary
-                return self.pos.x + self.radius >= point1.x
+                return self.x + self.radius >= point1[0]
             else:
                 # handle left boundary
-                return self.pos.x - self.radius <= point1.x
+                return self.x - self.radius <= point1[0]
 
         else:
             # handle horizontal line
-            if on_side.y < point1.y:
+            if on_side[1] < point1[1]:
                 # handle bottom boundary
-                return self.pos.y + self.radius >= point1.y
+                return self.y + self.radius >= point1[1]
             else:
                 # handle top boundary
-                return self.pos.y - self.radius <= point1.y
+                return self.y - self.radius <= point1[1]
+
+    def is_inside(self, bounds: Bounds) -> bool:
+        # Clear of all four sides, with no edge touching
+        left, top, right, bottom = bounds
+        radius = self.radius
+        return (
+            left < self.x - radius
+            and self.x + radius < right
+            and top < self.y - radius
+            and self.y + radius < bottom
+        )
 
-    def snap_to(self, edge: Edge, on_side: Vector2) -> None:
+    def snap_to(self, edge: Edge, on_side: Point) -> None:
         if self.is_vertical(edge):
-            self.vel.x *= -1
-            dx = abs(abs(edge[0].x - self.pos.x) - self.radius)
-            if on_side.x < edge[0].x:
+            self.vx *= -1
+            edge_x = edge[0][0]
+            dx = abs(abs(edge_x - self.x) - self.radius)
+            if on_side[0] < edge_x:
                 # right boundary
-                self.pos.x = edge[0].x - (self.radius + dx)
+                self.x = edge_x - (self.radius + dx)
             else:
                 # left boundary
-                self.pos.x = edge[0].x + (self.radius + dx)
+                self.x = edge_x + (self.radius + dx)
         else:
-            self.vel.y *= -1
-            dy = abs(abs(edge[0].y - self.pos.y) - self.radius)
-            if on_side.y < edge[0].y:
+            self.vy *= -1
+            edge_y = edge[0][1]
+            dy = abs(abs(edge_y - self.y) - self.radius)
+            if on_side[1] < edge_y:
                 # bottom boundary
-                self.pos.y = edge[0].y - (self.radius + dy)
+                self.y = edge_y - (self.radius + dy)
             else:
                 # top boundary
-                self.pos.y = edge[0].y + (self.radius + dy)
+                self.y = edge_y + (self.radius + dy)
 
     def is_vertical(self, edge: Edge) -> bool:
-        edge_span = edge[1] - edge[0]
-        return abs(edge_span.y) > abs(edge_span.x)
+        return abs(edge[1][1] - edge[0][1]) > abs(edge[1][0] - edge[0][0])
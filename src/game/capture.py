@@ -0,0 +1,193 @@
+"""Frames and pixel observations from an offscreen ``Game``.
+
+``FrameCapture`` exposes the screen through ``pygame.surfarray`` views,
+so reading a frame copies nothing. A view locks the surface until it is
+released, so use it and drop it before the next draw.
+
+``FrameWriter`` encodes frames on a background thread. It copies each
+frame once, into one of a fixed number of preallocated slots. Full
+screen frames are copied as the surface's own 32-bit pixels, a plain
+memcpy, and reordered to RGB on the writer thread. When every
+slot is waiting to be written, ``submit`` drops the frame by default
+instead of stalling the caller, so memory stays bounded either way.
+
+Raw output is a headerless byte stream, one frame after another, with
+shape, dtype and fps in a ``.json`` file beside it. RGB streams can go
+straight to ffmpeg:
+
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 400x400 -r 30 -i frames.rgb out.mp4
+"""
+from __future__ import annotations
+import json
+import os
+import queue
+import threading
+from typing import BinaryIO, Optional, Tuple
+import numpy as np
+import pygame
+
+from src.game.game import Game
+
+WRITER_SLOTS = 8
+FORMATS = ("raw", "png")
+# ITU-R BT.601 luma weights for R, G, B
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class FrameCapture:
+    """Views of ``game.screen``, optionally downsampled and greyscale."""
+
+    def __init__(self, game: Game, downsample: int = 1, greyscale: bool = False):
+        if not game.offscreen:
+            raise ValueError("FrameCapture needs a Game created with offscreen=True")
+        self.game = game
+        self.downsample = downsample
+        self.greyscale = greyscale
+        height = -(-game.height // downsample)
+        width = -(-game.width // downsample)
+        self.shape: Tuple[int, ...] = (
+            (height, width) if greyscale else (height, width, 3)
+        )
+        self.observation_buffer = np.zeros(self.shape, dtype=np.uint8)
+        self.luma_buffer = np.zeros((height, width), dtype=np.float32)
+        # Byte offsets of R, G and B within each 32-bit pixel
+        shifts = game.screen.get_shifts()
+        self.rgb_channels = (shifts[0] // 8, shifts[1] // 8, shifts[2] // 8)
+
+    @property
+    def raw(self) -> bool:
+        # No downsampling or greyscale: frames are the screen itself
+        return self.downsample == 1 and not self.greyscale
+
+    def frame(self) -> np.ndarray:
+        """The screen as an (height, width, 3) uint8 view, not a copy."""
+        return pygame.surfarray.pixels3d(self.game.screen).transpose(1, 0, 2)
+
+    def pixels(self) -> np.ndarray:
+        """The screen's 32-bit pixels as a contiguous (height, width, 4)
+        uint8 view, with channels in ``rgb_channels`` order."""
+        rows = pygame.surfarray.pixels2d(self.game.screen).T
+        return rows.view(np.uint8).reshape(*rows.shape, 4)
+
+    def observation(self) -> np.ndarray:
+        """The screen downsampled by striding, into a reused buffer.
+
+        Overwritten by the next call; copy it to keep it.
+        """
+        step = self.downsample
+        view = self.frame()[::step, ::step]
+        if self.greyscale:
+            np.matmul(view, LUMA, out=self.luma_buffer)
+            np.copyto(self.observation_buffer, self.luma_buffer, casting="unsafe")
+        else:
+            np.copyto(self.observation_buffer, view)
+        return self.observation_buffer
+
+    def grab(self) -> np.ndarray:
+        # What a FrameWriter made with writer_channels expects
+        return self.pixels() if self.raw else self.observation()
+
+    @property
+    def writer_channels(self) -> Optional[Tuple[int, int, int]]:
+        return self.rgb_channels if self.raw else None
+
+
+class FrameWriter(threading.Thread):
+    """Writes submitted frames from a background thread.
+
+    ``fmt`` is "raw", one stream file at ``path``, or "png", one image per
+    frame in the directory ``path`` (RGB frames only). With ``channels``,
+    submitted frames are (height, width, 4) pixels from
+    ``FrameCapture.pixels`` and are written as RGB in ``shape``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        shape: Tuple[int, ...],
+        fps: int,
+        fmt: str = "raw",
+        slots: int = WRITER_SLOTS,
+        block: bool = False,
+        channels: Optional[Tuple[int, int, int]] = None,
+    ) -> None:
+        super().__init__(name="frame-writer", daemon=True)
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown frame format {fmt!r}, expected one of {FORMATS}")
+        if fmt == "png" and (len(shape) != 3 or shape[2] != 3):
+            raise ValueError("png output needs (height, width, 3) frames")
+        self.path = path
+        self.shape = shape
+        self.fps = fps
+        self.fmt = fmt
+        self.block = block
+        self.channels = None if channels is None else list(channels)
+        slot_shape = shape if channels is None else (*shape[:2], 4)
+        self.buffers = np.zeros((slots, *slot_shape), dtype=np.uint8)
+        self.rgb_buffer = np.zeros(shape, dtype=np.uint8)
+        self.free: queue.Queue[int] = queue.Queue()
+        for ix in range(slots):
+            self.free.put(ix)
+        self.filled: queue.Queue[Optional[int]] = queue.Queue()
+        self.written = 0
+        self.dropped = 0
+
+        self.file: Optional[BinaryIO] = None
+        if fmt == "raw":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, "wb")
+        else:
+            os.makedirs(path, exist_ok=True)
+        self.start()
+
+    def submit(self, frame: np.ndarray) -> bool:
+        """Queue a copy of ``frame``. False if it was dropped."""
+        try:
+            ix = self.free.get(block=self.block)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        np.copyto(self.buffers[ix], frame)
+        self.filled.put(ix)
+        return True
+
+    def run(self) -> None:
+        while True:
+            ix = self.filled.get()
+            if ix is None:
+                return
+            self.write(self.buffers[ix])
+            self.written += 1
+            self.free.put(ix)
+
+    def write(self, frame: np.ndarray) -> None:
+        if self.channels is not None:
+            frame = np.take(frame, self.channels, axis=2, out=self.rgb_buffer)
+        if self.file is not None:
+            self.file.write(frame.data)
+        else:
+            height, width = self.shape[:2]
+            image = pygame.image.frombuffer(frame.data, (width, height), "RGB")
+            pygame.image.save(image, os.path.join(self.path, f"{self.written:06d}.png"))
+
+    def close(self) -> None:
+        """Write everything queued, then the raw stream's metadata."""
+        if not self.is_alive():
+            return
+        self.filled.put(None)
+        self.join()
+        if self.file is not None:
+            self.file.close()
+            with open(f"{self.path}.json", "w") as f:
+                json.dump(
+                    {
+                        "shape": list(self.shape),
+                        "dtype": "uint8",
+                        "fps": self.fps,
+                        "frames": self.written,
+                        "dropped": self.dropped,
+                    },
+                    f,
+                )
@@ -0,0 +1,202 @@
+"""Physics at a fixed timestep, drawing at its own capped rate.
+
+``run_decoupled`` keeps two clocks. Simulation time advances by the
+frames each ``step`` callback reports; display time advances with the
+wall clock, scaled by ``speed``. Each display frame runs steps until the
+simulation is ahead of the display, then draws the two latest snapshots
+interpolated to the display time. Physics results therefore do not
+depend on the frame rate, and at high speed many steps share one draw and
+flip.
+
+With ``threaded=True`` frames are drawn into the screen surface on a
+``RenderThread``. Events, and putting drawn frames on the display, stay
+on the calling thread, because SDL requires both to happen on the thread
+that owns the window.
+"""
+from __future__ import annotations
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional
+import numpy as np
+import pygame
+
+from src.simulation.simulation import Simulation
+
+if TYPE_CHECKING:
+    from src.game.game import Game
+
+DISPLAY_FPS = 60
+# Steps allowed per display frame before the display gives up catching
+# up, so a slow step cannot snowball into ever longer frames
+MAX_STEPS_PER_FRAME = 240
+
+
+@dataclass
+class Snapshot:
+    positions: np.ndarray  # (num shapes, 2): players then ball
+    score: int
+    n_placements: int
+
+    @classmethod
+    def of(cls, sim: Simulation) -> Snapshot:
+        return cls(
+            np.array([shape.shape.pos for shape in sim.shapes]),
+            sim.score,
+            sim.n_placements,
+        )
+
+    def lerp(self, later: Snapshot, alpha: float) -> Snapshot:
+        # Placements teleport shapes, so never blend across one
+        if later.n_placements != self.n_placements or alpha >= 1.0:
+            return later
+        return Snapshot(
+            self.positions + alpha * (later.positions - self.positions),
+            later.score,
+            later.n_placements,
+        )
+
+
+class FixedTimestep:
+    """Tracks simulation time against display time."""
+
+    def __init__(self, dt: float, speed: float = 1.0) -> None:
+        self.dt = dt
+        self.speed = speed
+        self.sim_time = 0.0  # end of the latest step
+        self.prev_time = 0.0  # end of the step before it
+        self.display_time = 0.0
+
+    def tick(self, elapsed: float) -> None:
+        self.display_time += elapsed * self.speed
+
+    @property
+    def behind(self) -> bool:
+        return self.sim_time <= self.display_time
+
+    def stepped(self, frames: int) -> None:
+        self.prev_time = self.sim_time
+        self.sim_time += frames * self.dt
+
+    def catch_up(self) -> None:
+        # Drop the backlog instead of trying to step through it
+        self.display_time = self.sim_time
+
+    @property
+    def alpha(self) -> float:
+        span = self.sim_time - self.prev_time
+        if span <= 0.0:
+            return 1.0
+        return min(1.0, max(0.0, (self.display_time - self.prev_time) / span))
+
+
+class RenderThread(threading.Thread):
+    """Draws the latest submitted snapshot, dropping stale ones.
+
+    Drawing only touches the screen surface. ``present``, called from the
+    window's thread, shows a drawn frame; the render thread waits for it
+    before drawing the next one, so the surface never changes while it is
+    being shown. Once started, only this thread may draw the game.
+    """
+
+    def __init__(self, game: Game) -> None:
+        super().__init__(name="render", daemon=True)
+        self.game = game
+        self.snapshots: queue.Queue[Optional[Snapshot]] = queue.Queue(maxsize=1)
+        self.drawn: queue.Queue[Optional[List[pygame.Rect]]] = queue.Queue()
+        self.presented = threading.Semaphore(0)
+
+    def submit(self, snapshot: Optional[Snapshot]) -> None:
+        try:
+            self.snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        self.snapshots.put(snapshot)
+
+    def present(self) -> None:
+        """Show the last drawn frame, if one is waiting."""
+        try:
+            dirty = self.drawn.get_nowait()
+        except queue.Empty:
+            return
+        self.game.present(dirty)
+        self.presented.release()
+
+    def run(self) -> None:
+        while True:
+            snapshot = self.snapshots.get()
+            if snapshot is None:
+                return
+            with self.game.profiler.phase("play_step.draw"):
+                dirty = self.game.draw_frame(snapshot)
+            self.drawn.put(dirty)
+            self.presented.acquire()
+
+    def stop(self) -> None:
+        self.submit(None)
+        # Release a draw still waiting to be presented
+        self.presented.release()
+        self.join()
+
+
+def run_decoupled(
+    game: Game,
+    step: Callable[[], int],
+    display_fps: int = DISPLAY_FPS,
+    speed: Optional[float] = 1.0,
+    threaded: bool = False,
+) -> None:
+    """Call ``step`` at ``game.fps`` simulated steps per second until the
+    window is closed, drawing at most ``display_fps`` times a second.
+
+    ``step`` advances ``game.sim`` and returns how many physics frames it
+    covered, or 0 to end the loop. With ``speed=None`` steps run as fast
+    as they can, and the latest state is drawn once per display frame.
+    """
+    timestep = FixedTimestep(1 / game.fps, speed or 1.0)
+    frame_budget = 1 / display_fps
+    renderer = RenderThread(game) if threaded else None
+    if renderer is not None:
+        renderer.start()
+    previous = latest = Snapshot.of(game.sim)
+    last = time.perf_counter()
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+
+            now = time.perf_counter()
+            if speed is None:
+                deadline = now + frame_budget
+                while time.perf_counter() < deadline:
+                    if not step():
+                        return
+                frame = previous = latest = Snapshot.of(game.sim)
+            else:
+                timestep.tick(now - last)
+                steps = 0
+                while timestep.behind:
+                    if steps == MAX_STEPS_PER_FRAME:
+                        timestep.catch_up()
+                        break
+                    frames = step()
+                    if not frames:
+                        return
+                    previous = latest
+                    timestep.stepped(frames)
+                    latest = Snapshot.of(game.sim)
+                    steps += 1
+                frame = previous.lerp(latest, timestep.alpha)
+            last = now
+
+            if renderer is None:
+                game.draw(frame)
+            else:
+                renderer.present()
+                renderer.submit(frame)
+            game.clock.tick(display_fps)
+    finally:
+        if renderer is not None:
+            renderer.stop()
@@ -1,111 +1,109 @@
 from __future__ import annotations
 import pygame
-from pygame import Vector2, font
-from typing import Tuple
+from pygame import font
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 import numpy as np
-import random
 
-from src.enums.direction import Direction
+from src.components.shape import Point, Shape
 from src.components.player import Player
 from src.components.ball import Ball
 from src.components.goals import Goals
 from src.components.field import Field
-from src.types.actionarr import ActionArr
+from src.simulation.simulation import Simulation
+from src.profiling.profiler import NULL_PROFILER, Profiler
+
+if TYPE_CHECKING:
+    from src.game.frame_loop import Snapshot
+    from src.simulation.recording import EpisodeRecorder
+    from src.types.actionarr import ActionArr
 
 
 # reward
 # game_iteration
 
+WHITE = (255, 255, 255)
+# Transparent colour of the overlay layer, which nothing is drawn in
+OVERLAY_KEY = (255, 0, 255)
+
 
 class Game:
     def __init__(
-        self, height: int, width: int, fps: int, game_duration_frames: int
+        self,
+        height: int,
+        width: int,
+        fps: int,
+        game_duration_frames: int,
+        num_players: int = 1,
+        offscreen: bool = False,
     ) -> None:
         self.fps = fps
         self.game_duration_frames = game_duration_frames
         self.height = height
         self.width = width
         self.clock = pygame.time.Clock()
+        self.sim = Simulation(width, height, game_duration_frames, num_players)
+        self.profiler: Profiler = NULL_PROFILER
+        # Draw into a plain surface instead of a window, for capture
+        self.offscreen = offscreen
+        # Regions drawn over last frame, to erase next frame. None means
+        # the whole screen needs drawing
+        self.dirty: Optional[List[pygame.Rect]] = None
+        self.score_text: Optional[pygame.Surface] = None
+        self.score_text_value = -1
+
+    @property
+    def player(self) -> Player:
+        return self.sim.player
+
+    @property
+    def ball(self) -> Ball:
+        return self.sim.ball
+
+    @property
+    def goals(self) -> Goals:
+        return self.sim.goals
+
+    @property
+    def field(self) -> Field:
+        return self.sim.field
+
+    @property
+    def score(self) -> int:
+        return self.sim.score
 
     def reset_game(self) -> None:
         pygame.init()
         self.font = font.SysFont("jetbrainsmononerdfontmono.tff", 48)
 
-        pygame.display.set_caption("AFL Simulator")
-        self.screen = pygame.display.set_mode((self.width, self.height))
-
-        self.setup_field()
-        self.place_players_and_ball()
-
-        self.score = 0
-
-    def setup_field(self) -> None:
-        self.player = Player(self.screen, Vector2(-100, -100))
-        self.ball = Ball(self.screen, Vector2(-100, -200))
-        self.goals = Goals(
-            self.screen,
-            Vector2(self.screen.get_width() * 0.4, self.screen.get_height() * 0.15),
-            Vector2(self.screen.get_width() * 0.6, self.screen.get_height() * 0.15),
-        )
-        self.field = Field(
-            self.screen,
-            Vector2(self.screen.get_width() * 0.1, self.screen.get_height() * 0.1),
-            width=self.screen.get_width() * 0.8,
-            height=self.screen.get_height() * 0.8,
-        )
-
-    def place_players_and_ball(self) -> None:
-        ball_start_x = random.uniform(0.15, 0.85)
-        ball_start_y = random.uniform(0.15, 0.45)
-        ball_start = Vector2(
-            self.screen.get_width() * ball_start_x,
-            self.screen.get_height() * ball_start_y,
-        )
-
-        player_start_x = random.uniform(0.15, 0.85)
-        player_start_y = random.uniform(0.55, 0.85)
-        player_start = Vector2(
-            self.screen.get_width() * player_start_x,
-            self.screen.get_height() * player_start_y,
-        )
-
-        self.ball.shape.pos = ball_start
-        self.ball.shape.vel = Vector2(0, 0)
-
-        self.player.shape.pos = player_start
-        self.player.shape.vel = Vector2(0, 0)
-
-    def play_step(self, dt: float, actions: ActionArr) -> Tuple[int, bool, int]:
-        reward = 0
+        if self.offscreen:
+            # 32-bit, which surfarray can view without copying
+            self.screen = pygame.Surface((self.width, self.height), depth=32)
+        else:
+            pygame.display.set_caption("AFL Simulator")
+            self.screen = pygame.display.set_mode((self.width, self.height))
+
+        self.sim.reset()
+        self.render_static_layers()
+
+    def play_step(
+        self,
+        dt: float,
+        actions: ActionArr,
+        repeat: int = 1,
+        recorder: Optional[EpisodeRecorder] = None,
+    ) -> Tuple[int, bool, int]:
+        # With repeat > 1, the action is held for that many physics frames
+        # and only the last one is drawn
         game_over = False
+        profiler = self.profiler
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game_over = True
-
-        # Handle goal score
-        if self.goals.check_goal(self.ball, dt):
-            self.score += 1
-            self.place_players_and_ball()
-            reward = 100
-
-        # Handle player input
-        actions_list = [
-            Direction.RIGHT,
-            Direction.DOWN,
-            Direction.LEFT,
-            Direction.UP,
-        ]
-        for ix in np.where(actions == 1)[0]:
-            self.player.accelerate(actions_list[ix])
-
-        # Handle collisions (with negative rewards)
-        reward += self.ball.handle_collision(self.player)
-        reward += self.field.resolve_collisions([self.player, self.ball])
+        with profiler.phase("play_step.events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    game_over = True
 
-        # Update positions
-        self.player.update(dt)
-        self.ball.update(dt)
+        with profiler.phase("play_step.physics"):
+            reward, _, score = self.sim.step_repeat(dt, actions, repeat, recorder)
 
         # Pause here to meet target FPS
         # self.clock.tick(self.fps)
@@ -113,7 +111,7 @@ class Game:
         # Draw
         self.draw()
 
-        return reward, game_over, self.score
+        return reward, game_over, score
 
     def parse_keys(self) -> ActionArr:
         keys = pygame.key.get_pressed()
@@ -129,20 +127,121 @@ class Game:
 
         return actions
 
-    def draw(self) -> None:
-        self.screen.fill("green")
-        self.player.draw()
-        self.ball.draw()
-        self.goals.draw()
-        self.field.draw()
-
-        WHITE = (255, 255, 255)
-        text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(
-            text, (0.001 * self.screen.get_width(), 0.001 * self.screen.get_height())
+    def draw(self, snapshot: Optional[Snapshot] = None) -> None:
+        with self.profiler.phase("play_step.draw"):
+            dirty = self.draw_frame(snapshot)
+        self.present(dirty)
+
+    def present(self, dirty: Optional[List[pygame.Rect]]) -> None:
+        # Puts drawn regions on the display; SDL needs this on the thread
+        # that owns the window
+        if self.offscreen:
+            return
+        with self.profiler.phase("play_step.flip"):
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+
+    def render_static_layers(self) -> None:
+        # The field and goals never move, so they are drawn once: onto the
+        # background, and onto a keyed overlay that keeps them on top of
+        # the shapes
+        # Layers share the screen's pixel format, so blits need no conversion
+        size = self.screen.get_size()
+        self.background = pygame.Surface(size, 0, self.screen)
+        self.background.fill("green")
+        self.overlay = pygame.Surface(size, 0, self.screen)
+        self.overlay.fill(OVERLAY_KEY)
+        self.overlay.set_colorkey(OVERLAY_KEY)
+        for layer in (self.background, self.overlay):
+            self.draw_goals(self.goals, layer)
+            self.draw_field(self.field, layer)
+        self.score_text_pos = (
+            0.001 * self.screen.get_width(),
+            0.001 * self.screen.get_height(),
+        )
+        self.score_text = None
+        self.dirty = None
+
+    def draw_frame(
+        self, snapshot: Optional[Snapshot] = None
+    ) -> Optional[List[pygame.Rect]]:
+        """Draw the simulation as it is now, or as captured in ``snapshot``.
+
+        Only what moved since the last call is redrawn. Returns the screen
+        regions that changed, or None if all of it did.
+        """
+        screen = self.screen
+        background = self.background
+        if snapshot is None:
+            score = self.score
+        else:
+            score = snapshot.score
+
+        # Erase last frame's shapes, and the score text if it will change
+        text = self.score_text
+        erased = self.dirty
+        if erased is None:
+            screen.blit(background, (0, 0))
+        else:
+            if text is not None and score != self.score_text_value:
+                erased = erased + [text.get_rect(topleft=self.score_text_pos)]
+            for rect in erased:
+                screen.blit(background, rect, rect)
+        if text is not None and score != self.score_text_value:
+            text = None
+
+        shapes = [shape.shape for shape in self.sim.shapes]
+        positions: Union[List[Point], np.ndarray] = (
+            [shape.pos for shape in shapes] if snapshot is None else snapshot.positions
+        )
+        drawn = [
+            self.draw_shape(shape, pos).inflate(2, 2)
+            for shape, pos in zip(shapes, positions)
+        ]
+        overlay = self.overlay
+        for rect in drawn:
+            screen.blit(overlay, rect, rect)
+
+        if text is None:
+            text = self.font.render(f"Score: {score}", True, WHITE)
+            self.score_text = text
+            self.score_text_value = score
+            drawn.append(screen.blit(text, self.score_text_pos))
+        else:
+            # Erasing or drawing a shape over the text means blitting it again
+            text_rect = text.get_rect(topleft=self.score_text_pos)
+            if (
+                erased is None
+                or text_rect.collidelist(erased) != -1
+                or text_rect.collidelist(drawn) != -1
+            ):
+                drawn.append(screen.blit(text, self.score_text_pos))
+
+        self.dirty = drawn
+        if erased is None:
+            return None
+        return erased + drawn
+
+    def draw_shape(self, shape: Shape, pos: Optional[Point] = None) -> pygame.Rect:
+        return pygame.draw.circle(
+            self.screen,
+            color=shape.color,
+            center=shape.pos if pos is None else pos,
+            radius=shape.radius,
+        )
+
+    def draw_goals(self, goals: Goals, surface: pygame.Surface) -> None:
+        pygame.draw.circle(
+            surface, color="white", center=goals.left_pos, radius=goals.post_radius
+        )
+        pygame.draw.circle(
+            surface, color="white", center=goals.right_pos, radius=goals.post_radius
         )
 
-        pygame.display.flip()
+    def draw_field(self, field: Field, surface: pygame.Surface) -> None:
+        pygame.draw.lines(surface, color="white", closed=True, points=field.corners)
 
     def quit(self) -> None:
         pygame.quit()
@@ -0,0 +1,28 @@
+from src.game.frame_loop import run_decoupled
+from src.game.game import Game
+
+
+def play_human(width: int, height: int, fps: int, game_duration_frames: int) -> None:
+    game = Game(
+        width=width, height=height, fps=fps, game_duration_frames=game_duration_frames
+    )
+    game.reset_game()
+    sim = game.sim
+    dt = 1 / fps
+    frame_count = 0
+
+    def step() -> int:
+        nonlocal frame_count
+        # Keys are read once per physics step, from the last event pump
+        final_move = game.parse_keys()
+        _, _, score = sim.step(dt, final_move)
+        frame_count += 1
+
+        if frame_count >= game_duration_frames:
+            print(f"Game over! {score=}")
+            sim.reset()
+            frame_count = 0
+        return 1
+
+    run_decoupled(game, step)
+    game.quit()
@@ -0,0 +1,86 @@
+"""Action selection without autograd.
+
+For a 6-32-4 network the cost of a forward pass is almost all framework
+overhead, so there are two lighter paths than calling the model directly:
+
+- ``NumpyPolicy`` runs ``Linear_QNet.forward`` as two NumPy matmuls.
+- ``TorchPolicy`` runs any module under ``torch.inference_mode``. Use it
+  for models NumPy cannot run, such as ``quantize_int8`` output.
+
+Both give action indices for one observation (``act``) or a batch
+(``act_batch``).
+"""
+from __future__ import annotations
+import numpy as np
+import torch
+from torch import nn
+
+from src.model.model import Linear_QNet
+
+
+class NumpyPolicy:
+    """``Linear_QNet.forward`` in NumPy.
+
+    The weight arrays are views of the model's parameters, not copies, so
+    in-place updates such as optimizer steps or ``load_state_dict`` are
+    picked up without reloading.
+    """
+
+    def __init__(self, model: Linear_QNet) -> None:
+        self.model = model
+        self.w1 = model.linear1.weight.detach().numpy().T
+        self.b1 = model.linear1.bias.detach().numpy()
+        self.w2 = model.linear2.weight.detach().numpy().T
+        self.b2 = model.linear2.bias.detach().numpy()
+        # A float32 array, not the scalar 0.0, skips type promotion in relu
+        self.zeros = np.zeros_like(self.b1)
+
+    def q_values(self, states: np.ndarray) -> np.ndarray:
+        hidden = np.dot(states, self.w1)
+        hidden += self.b1
+        np.maximum(hidden, self.zeros, out=hidden)
+        q = np.dot(hidden, self.w2)
+        q += self.b2
+        return q
+
+    def act(self, state: np.ndarray) -> int:
+        return int(self.q_values(state).argmax())
+
+    def act_batch(self, states: np.ndarray) -> np.ndarray:
+        return self.q_values(states).argmax(axis=1)
+
+
+class TorchPolicy:
+    """Any Q-network run under ``inference_mode`` on NumPy input.
+
+    Inputs are wrapped with ``torch.from_numpy``, which shares memory
+    instead of copying.
+    """
+
+    def __init__(self, model: nn.Module) -> None:
+        self.model = model.eval()
+
+    def q_values(self, states: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            batch = torch.from_numpy(np.asarray(states, dtype=np.float32))
+            if batch.dim() == 1:
+                # Quantized linear layers only accept batched input
+                return self.model(batch.unsqueeze(0))[0].numpy()
+            return self.model(batch).numpy()
+
+    def act(self, state: np.ndarray) -> int:
+        return int(self.q_values(state).argmax())
+
+    def act_batch(self, states: np.ndarray) -> np.ndarray:
+        return self.q_values(states).argmax(axis=1)
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """Copy of ``model`` with int8 weights for its linear layers.
+
+    Activations are quantized on the fly per call. For playing only: the
+    result cannot be trained.
+    """
+    return torch.ao.quantization.quantize_dynamic(
+        model, {nn.Linear}, dtype=torch.qint8
+    )
@@ -1,10 +1,13 @@
+from __future__ import annotations
+import copy
 import torch
 from torch import nn, optim, Tensor
 from torch.nn import functional as F
 import os
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Optional
 
-from src.types.actionarr import ActionArr, StateArr
+if TYPE_CHECKING:
+    from src.types.actionarr import ActionArr, StateArr
 
 
 class Linear_QNet(nn.Module):
@@ -32,13 +35,30 @@ class Linear_QNet(nn.Module):
 
 
 class QTrainer:
-    def __init__(self, model: nn.Module, lr: float, gamma: float):
+    def __init__(
+        self,
+        model: nn.Module,
+        lr: float,
+        gamma: float,
+        target_sync_steps: Optional[int] = None,
+    ):
         self.model = model
         self.lr = lr
         self.gamma = gamma
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
         self.criterion = nn.MSELoss()
 
+        # With target_sync_steps set, Bellman targets come from a frozen copy
+        # of the model that is refreshed every target_sync_steps updates
+        self.target_sync_steps = target_sync_steps
+        self.target_model: Optional[nn.Module] = None
+        if target_sync_steps is not None:
+            self.target_model = copy.deepcopy(model)
+            self.target_model.requires_grad_(False)
+        self.n_updates = 0
+        # Per-sample TD errors of the last train_step, for prioritized replay
+        self.td_errors = torch.zeros(0)
+
     def train_single_step(
         self,
         state: StateArr,
@@ -46,52 +66,66 @@ class QTrainer:
         reward: int,
         next_state: StateArr,
         game_over: bool,
-    ) -> None:
-        self.train_step(
-            [state],
-            [action],
-            [reward],
-            [next_state],
-            (game_over,),
+    ) -> float:
+        return self.train_step(
+            torch.tensor(state, dtype=torch.float).unsqueeze(0),
+            torch.tensor([int(action.argmax())]),
+            torch.tensor([reward], dtype=torch.float),
+            torch.tensor(next_state, dtype=torch.float).unsqueeze(0),
+            torch.tensor([game_over]),
         )
 
     def train_step(
         self,
-        state: List[StateArr],
-        action: List[ActionArr],
-        reward: List[int],
-        next_state: List[StateArr],
-        game_over: Tuple[bool],
-    ) -> None:
-        state0 = torch.tensor(state, dtype=torch.float)
-        action0 = torch.tensor(action, dtype=torch.float)
-        reward0 = torch.tensor(reward, dtype=torch.float)
-        next_state0 = torch.tensor(next_state, dtype=torch.float)
-        game_over0 = game_over
-
-        # 1: predict
-        pred = self.model(state0)
-
-        target = pred.clone()
-
-        for idx in range(len(game_over0)):
-            Q_new = reward0[idx]
-            if not game_over0[idx]:
-                Q_new = reward0[idx] + self.gamma * torch.max(
-                    self.model(next_state0[idx])
+        state: Tensor,
+        action: Tensor,
+        reward: Tensor,
+        next_state: Tensor,
+        game_over: Tensor,
+        n_steps: int = 1,
+        weights: Optional[Tensor] = None,
+    ) -> float:
+        # Batches come straight from ReplayMemory.sample: float32 states,
+        # action indices, rewards and game-over flags, one row per sample.
+        # Optional per-sample weights (importance sampling) scale the loss
+        state0 = state.float()
+        action0 = action.long().unsqueeze(1)
+        reward0 = reward.float()
+        next_state0 = next_state.float()
+        not_over0 = (~game_over.bool()).float()
+
+        loss = torch.zeros(())
+        for _ in range(n_steps):
+            # Q_new = r + y * max(next_predicted Q value) -> only if not done
+            with torch.no_grad():
+                next_model = (
+                    self.model if self.target_model is None else self.target_model
                 )
-            target[idx][torch.argmax(action0).item()] = Q_new
-
-        # 2: Q_new = r + y * max(next_predicted Q value) -> only do this i fnot done
-        # pred.clone()
-        # preds[argmax(action)] = Q_new
-
-        # Calc loss
-        self.optimizer.zero_grad()
-        loss = self.criterion(target, pred)
-        loss.backward()
-
-        self.optimizer.step()
+                next_q = next_model(next_state0).max(dim=1).values
+                Q_new = reward0 + self.gamma * next_q * not_over0
+
+            pred = self.model(state0)
+            target = pred.detach().scatter(1, action0, Q_new.unsqueeze(1))
+
+            # Calc loss
+            self.optimizer.zero_grad()
+            if weights is None:
+                loss = self.criterion(target, pred)
+            else:
+                loss = (weights.unsqueeze(1) * (target - pred) ** 2).mean()
+            loss.backward()
+
+            self.optimizer.step()
+            self.n_updates += 1
+            if self.target_sync_steps and self.n_updates % self.target_sync_steps == 0:
+                self.sync_target_model()
+
+        self.td_errors = (target - pred.detach()).gather(1, action0).squeeze(1)
+        return float(loss.item())
+
+    def sync_target_model(self) -> None:
+        if self.target_model is not None:
+            self.target_model.load_state_dict(self.model.state_dict())
 
 
 def generate_filename() -> str:
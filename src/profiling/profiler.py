@@ -0,0 +1,170 @@
+from __future__ import annotations
+import atexit
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+REPORT_INTERVAL = 10.0  # seconds between printed summaries
+MAX_TRACE_EVENTS = 500_000  # ~40 MB of JSON; later phases are counted, not traced
+
+
+class Phase:
+    """Context manager timing one named phase; reused for every call."""
+
+    __slots__ = ("name", "calls", "total_ns", "start_ns", "trace")
+
+    def __init__(self, name: str, trace: Optional[List[Tuple[str, int, int]]]):
+        self.name = name
+        self.calls = 0
+        self.total_ns = 0
+        self.start_ns = 0
+        self.trace = trace
+
+    def __enter__(self) -> None:
+        self.start_ns = time.perf_counter_ns()
+
+    def __exit__(self, *exc: object) -> None:
+        end_ns = time.perf_counter_ns()
+        self.calls += 1
+        self.total_ns += end_ns - self.start_ns
+        trace = self.trace
+        if trace is not None and len(trace) < MAX_TRACE_EVENTS:
+            trace.append((self.name, self.start_ns, end_ns))
+
+
+class NullPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+NULL_PHASE = NullPhase()
+
+
+class Profiler:
+    """Cumulative wall time and call counts per phase, plus event counters.
+
+    Wrap code in ``with profiler.phase("name"):``. When disabled, ``phase``
+    returns a shared no-op context manager and ``count`` returns at once, so
+    instrumented loops pay only the method call. With ``trace_path`` set,
+    every phase call is also kept as a Chrome trace event (load the file in
+    chrome://tracing or Perfetto); the file is rewritten on each report.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        trace_path: Optional[str] = None,
+        report_interval: float = REPORT_INTERVAL,
+    ) -> None:
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.report_interval = report_interval
+        self.phases: Dict[str, Phase] = {}
+        self.counters: Dict[str, int] = {}
+        self.trace: Optional[List[Tuple[str, int, int]]] = (
+            [] if enabled and trace_path else None
+        )
+        self.counter_trace: List[Tuple[int, Dict[str, int]]] = []
+        self.start_ns = time.perf_counter_ns()
+        self.last_report = time.monotonic()
+        if enabled:
+            atexit.register(self.close)
+
+    def phase(self, name: str) -> Phase | NullPhase:
+        if not self.enabled:
+            return NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(name, self.trace)
+        return phase
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def maybe_report(self) -> None:
+        """Print a summary if ``report_interval`` has passed since the last."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self.last_report >= self.report_interval:
+            self.last_report = now
+            self.report()
+
+    def report(self) -> None:
+        print(self.summary(), file=sys.stderr)
+        if self.trace is not None:
+            self.counter_trace.append((time.perf_counter_ns(), dict(self.counters)))
+            self.export_trace()
+
+    def summary(self) -> str:
+        elapsed_ns = max(time.perf_counter_ns() - self.start_ns, 1)
+        lines = [
+            f"{'phase':24s} {'calls':>10s} {'total s':>9s} {'mean us':>10s} "
+            f"{'% wall':>7s}"
+        ]
+        phases = sorted(self.phases.values(), key=lambda p: p.total_ns, reverse=True)
+        for phase in phases:
+            mean_us = phase.total_ns / phase.calls / 1000 if phase.calls else 0.0
+            lines.append(
+                f"{phase.name:24s} {phase.calls:10d} {phase.total_ns / 1e9:9.3f} "
+                f"{mean_us:10.1f} {100 * phase.total_ns / elapsed_ns:6.1f}%"
+            )
+        if self.counters:
+            lines.append(
+                "events: "
+                + ", ".join(f"{name}={n}" for name, n in sorted(self.counters.items()))
+            )
+        return "\n".join(lines)
+
+    def export_trace(self) -> None:
+        if self.trace is None or self.trace_path is None:
+            return
+        pid = os.getpid()
+        origin = self.start_ns
+        events: List[Dict[str, object]] = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": 0,
+            }
+            for name, start, end in self.trace
+        ]
+        events.extend(
+            {
+                "name": "events",
+                "ph": "C",
+                "ts": (at - origin) / 1000,
+                "pid": pid,
+                "args": counters,
+            }
+            for at, counters in self.counter_trace
+        )
+
+        directory = os.path.dirname(self.trace_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.trace_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, self.trace_path)
+
+    def close(self) -> None:
+        if not self.enabled:
+            return
+        self.report()
+        self.enabled = False
+        atexit.unregister(self.close)
+
+
+NULL_PROFILER = Profiler(enabled=False)
@@ -1,15 +1,16 @@
 from typing import Protocol, Tuple
-from pygame import Vector2
 
-Edge = Tuple[Vector2, Vector2]
+Point = Tuple[float, float]
+Edge = Tuple[Point, Point]
+Bounds = Tuple[float, float, float, float]
 
 
 class Snappable(Protocol):
-    def draw(self) -> None:
+    def is_colliding_with(self, edge: Edge, on_side: Point) -> bool:
         ...
 
-    def is_colliding_with(self, edge: Edge, on_side: Vector2) -> bool:
+    def snap_to(self, edge: Edge, on_side: Point) -> None:
         ...
 
-    def snap_to(self, edge: Edge, on_side: Vector2) -> None:
+    def is_inside(self, bounds: Bounds) -> bool:
         ...
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+
+from src.components.shape import Shape
+
+Pair = Tuple[int, int]
+
+# Cells are keyed by one int, x * STRIDE + y, offset so that positions a
+# little outside the field still give non-negative indices
+STRIDE = 1 << 16
+OFFSET = 1 << 10
+# Neighbouring cells visited from each cell, so every pair of adjacent
+# cells is looked at exactly once: (1, -1), (1, 0), (1, 1), (0, 1)
+HALF_NEIGHBOURHOOD = (STRIDE - 1, STRIDE, STRIDE + 1, 1)
+
+
+class SpatialHash:
+    """Uniform-grid broadphase over shapes' centres.
+
+    With ``cell_size`` at least the largest sum of two radii, overlapping
+    shapes are always in the same or adjacent cells, so only those pairs
+    are returned as candidates. Rebuilt from scratch on every call, which
+    is cheaper than tracking moves when nearly everything moves each frame.
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size = cell_size
+        self.inv_cell_size = 1.0 / cell_size
+
+    def pairs(self, shapes: Sequence[Shape]) -> List[Pair]:
+        """Candidate index pairs ``(i, j)`` with ``i < j``."""
+        inv = self.inv_cell_size
+        cells: Dict[int, List[int]] = {}
+        for ix, shape in enumerate(shapes):
+            key = int(shape.x * inv + OFFSET) * STRIDE + int(shape.y * inv + OFFSET)
+            members = cells.get(key)
+            if members is None:
+                cells[key] = [ix]
+            else:
+                members.append(ix)
+
+        pairs: List[Pair] = []
+        for key, members in cells.items():
+            n = len(members)
+            if n > 1:
+                for a in range(n):
+                    for b in range(a + 1, n):
+                        pairs.append((members[a], members[b]))
+            for offset in HALF_NEIGHBOURHOOD:
+                others = cells.get(key + offset)
+                if others is None:
+                    continue
+                for i in members:
+                    for j in others:
+                        pairs.append((i, j) if i < j else (j, i))
+        return pairs
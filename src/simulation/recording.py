@@ -0,0 +1,237 @@
+"""Compact binary recordings of played episodes.
+
+An episode is fully determined by its start positions and its actions,
+because ``Simulation.step`` is deterministic apart from re-placing the
+player and ball after a goal. Each placement is therefore recorded, with
+the frame it happened on, as exact float64. Actions are one uint8
+bitmask per frame. Per-frame positions and velocities can optionally be
+stored too, as float32, for stats that should not need re-simulating.
+
+Episodes are appended to one file, each with a fixed-size header:
+
+    header      HEADER (see below)
+    placements  n_placements x (uint32 frame, 4 x float64 position)
+    actions     n_frames x uint8
+    states      n_frames x 8 x float32, after each step (if flagged)
+
+State columns are player x, y, vx, vy then ball x, y, vx, vy.
+"""
+from __future__ import annotations
+import os
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+import numpy as np
+
+from src.simulation.simulation import Placement, Simulation
+
+MAGIC = b"AFLE"
+VERSION = 1
+HAS_STATES = 1
+# magic, version, flags, width, height, dt, frames, placements, score, reward
+HEADER = struct.Struct("<4sBBHHdIIif")
+PLACEMENT = np.dtype([("frame", "<u4"), ("position", "<f8", (4,))])
+STATE_COLUMNS = 8
+INITIAL_FRAMES = 2048
+
+ACTION_BITS = np.array([1, 2, 4, 8])  # ACTIONS_LIST order
+BITMASK_ACTIONS = ((np.arange(16)[:, None] & ACTION_BITS) > 0).astype(np.int64)
+
+
+@dataclass
+class Episode:
+    width: int
+    height: int
+    dt: float
+    score: int
+    total_reward: float
+    placements: np.ndarray  # PLACEMENT records
+    actions: np.ndarray  # uint8 bitmasks
+    states: Optional[np.ndarray]  # float32 (n_frames, 8)
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.actions)
+
+    def action_array(self, frame: int) -> np.ndarray:
+        """The frame's action decoded back to ``Simulation.step`` input."""
+        return BITMASK_ACTIONS[self.actions[frame]]
+
+
+class EpisodeRecorder:
+    """Buffers one episode in preallocated arrays, then appends it to a file.
+
+    Call ``begin`` after each reset, ``record`` after each step and ``end``
+    when the game is over. Only ``end`` touches the file, with one write
+    and flush per episode.
+    """
+
+    def __init__(self, path: str, record_states: bool = False) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.record_states = record_states
+        self.file: Optional[BinaryIO] = open(path, "ab")
+        self.actions = np.zeros(INITIAL_FRAMES, dtype=np.uint8)
+        self.states = np.zeros(
+            (INITIAL_FRAMES if record_states else 0, STATE_COLUMNS), dtype=np.float32
+        )
+        self.placements: List[Tuple[int, Placement]] = []
+        self.n_frames = 0
+        self.seen_placements = 0
+
+    def begin(self, sim: Simulation) -> None:
+        self.n_frames = 0
+        self.placements = [(0, sim.placement)]
+        self.seen_placements = sim.n_placements
+
+    def record(self, sim: Simulation, actions: np.ndarray) -> None:
+        ix = self.n_frames
+        if ix == len(self.actions):
+            self.grow()
+        self.actions[ix] = (
+            actions[0] | (actions[1] << 1) | (actions[2] << 2) | (actions[3] << 3)
+        )
+        if sim.n_placements != self.seen_placements:
+            # Placed after a goal during this step
+            self.seen_placements = sim.n_placements
+            self.placements.append((ix, sim.placement))
+        if self.record_states:
+            player = sim.player.shape
+            ball = sim.ball.shape
+            self.states[ix] = (
+                player.x,
+                player.y,
+                player.vx,
+                player.vy,
+                ball.x,
+                ball.y,
+                ball.vx,
+                ball.vy,
+            )
+        self.n_frames = ix + 1
+
+    def grow(self) -> None:
+        self.actions = np.resize(self.actions, 2 * len(self.actions))
+        if self.record_states:
+            self.states = np.resize(self.states, (2 * len(self.states), STATE_COLUMNS))
+
+    def end(self, sim: Simulation, dt: float, score: int, total_reward: float) -> None:
+        if not self.placements or self.file is None:
+            return
+        n = self.n_frames
+        placements = np.array(self.placements, dtype=PLACEMENT)
+        self.file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                HAS_STATES if self.record_states else 0,
+                sim.width,
+                sim.height,
+                dt,
+                n,
+                len(placements),
+                score,
+                total_reward,
+            )
+        )
+        self.file.write(placements.tobytes())
+        self.file.write(self.actions[:n].tobytes())
+        if self.record_states:
+            self.file.write(self.states[:n].tobytes())
+        self.file.flush()
+        self.placements = []
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_episodes(path: str) -> Iterator[Episode]:
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return  # end of file, or an episode cut off mid-write
+            (
+                magic,
+                version,
+                flags,
+                width,
+                height,
+                dt,
+                n_frames,
+                n_placements,
+                score,
+                total_reward,
+            ) = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} episode file")
+            placements = read_array(f, PLACEMENT, n_placements)
+            actions = read_array(f, np.dtype(np.uint8), n_frames)
+            states = None
+            if flags & HAS_STATES:
+                states = read_array(f, np.dtype(np.float32), n_frames * STATE_COLUMNS)
+                if states is None:
+                    return
+                states = states.reshape(n_frames, STATE_COLUMNS)
+            if placements is None or actions is None:
+                return
+            yield Episode(
+                width, height, dt, score, total_reward, placements, actions, states
+            )
+
+
+def read_array(f: BinaryIO, dtype: np.dtype, count: int) -> Optional[np.ndarray]:
+    """``count`` items from ``f``, or None if the file ends before them."""
+    data = f.read(dtype.itemsize * count)
+    if len(data) < dtype.itemsize * count:
+        return None
+    return np.frombuffer(data, dtype=dtype)
+
+
+class ReplaySimulation(Simulation):
+    """A ``Simulation`` that re-places the player and ball as recorded."""
+
+    def __init__(self, episode: Episode) -> None:
+        super().__init__(episode.width, episode.height, episode.n_frames)
+        self.episode = episode
+        self.next_placement = 0
+        self.frame = 0
+
+    def reset(self) -> None:
+        self.next_placement = 0
+        self.frame = 0
+        super().reset()
+
+    def place_players_and_ball(self) -> None:
+        placements = self.episode.placements
+        if self.next_placement < len(placements):
+            player_x, player_y, ball_x, ball_y = placements[self.next_placement][
+                "position"
+            ]
+            self.place((player_x, player_y, ball_x, ball_y))
+            self.next_placement += 1
+        else:
+            # Ran past the recording; fall back to random placement
+            super().place_players_and_ball()
+
+    def advance(self) -> int:
+        """Step one recorded frame and return its reward."""
+        reward, _, _ = self.step(self.episode.dt, self.episode.action_array(self.frame))
+        self.frame += 1
+        return reward
+
+    def seek(self, frame: int) -> None:
+        """Re-simulate from the start up to ``frame`` (headless, ~10 us/frame)."""
+        frame = max(0, min(frame, self.episode.n_frames))
+        if frame < self.frame:
+            self.reset()
+        while self.frame < frame:
+            self.advance()
+
+    @property
+    def finished(self) -> bool:
+        return self.frame >= self.episode.n_frames
@@ -0,0 +1,213 @@
+from __future__ import annotations
+from itertools import combinations
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+import random
+
+from src.enums.direction import Direction
+from src.components.player import Player
+from src.components.ball import Ball
+from src.components.goals import Goals
+from src.components.field import Field
+from src.simulation.broadphase import Pair, SpatialHash
+from src.simulation.observation import ObservationBuilder
+
+if TYPE_CHECKING:
+    from src.simulation.recording import EpisodeRecorder
+    from src.types.actionarr import ActionArr, StateArr
+
+
+Placement = Tuple[float, float, float, float]  # player x, y, ball x, y
+
+# Below this many players, checking every pair beats building the grid
+BROADPHASE_MIN_PLAYERS = 16
+OTHER_TEAM_COLOR = "orange"
+
+ACTIONS_LIST = [
+    Direction.RIGHT,
+    Direction.DOWN,
+    Direction.LEFT,
+    Direction.UP,
+]
+
+
+class Simulation:
+    """Headless game physics: no display, no event pump, no drawing.
+
+    ``players[0]`` (also ``player``) is the one the agent controls and is
+    rewarded for. Any further players alternate between its team and the
+    other one; they move only when ``step`` is given one action row per
+    player, and contacts between them are found with a ``SpatialHash``
+    once there are ``BROADPHASE_MIN_PLAYERS`` of them.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        game_duration_frames: int,
+        num_players: int = 1,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.game_duration_frames = game_duration_frames
+        self.num_players = num_players
+        self.score = 0
+        self.broadphase: Optional[SpatialHash] = None
+        if num_players >= BROADPHASE_MIN_PLAYERS:
+            self.broadphase = SpatialHash(2 * max(Player.radius, Ball.radius))
+        # Ball last, so a pair (i, ball) always has the ball second
+        self.all_pairs: List[Pair] = list(combinations(range(num_players + 1), 2))
+        # Goal posts never move, so observations can cache them
+        self.goal_posts = (
+            (width * 0.4, height * 0.15),
+            (width * 0.6, height * 0.15),
+        )
+        self.observer = ObservationBuilder(width, *self.goal_posts)
+        # Per-game reward event counts, read by the profiler at game end
+        self.kicks = 0
+        self.wall_hits = 0
+        # Latest player/ball start positions, for episode recording
+        self.placement: Placement = (0.0, 0.0, 0.0, 0.0)
+        self.n_placements = 0
+
+    def reset(self) -> None:
+        self.setup_field()
+        self.place_players_and_ball()
+
+        self.score = 0
+        self.kicks = 0
+        self.wall_hits = 0
+
+    def setup_field(self) -> None:
+        self.players = [
+            Player((-100, -100), None if ix % 2 == 0 else OTHER_TEAM_COLOR)
+            for ix in range(self.num_players)
+        ]
+        self.player = self.players[0]
+        self.ball = Ball((-100, -200))
+        self.shapes: Tuple[Union[Player, Ball], ...] = (*self.players, self.ball)
+        # Wall hits only cost reward for the agent's player and the ball
+        self.rewarded_shapes = (self.player, self.ball)
+        self.other_players = self.players[1:]
+        self.goals = Goals(*self.goal_posts)
+        self.field = Field(
+            (self.width * 0.1, self.height * 0.1),
+            width=self.width * 0.8,
+            height=self.height * 0.8,
+        )
+
+    def place_players_and_ball(self) -> None:
+        ball_start_x = random.uniform(0.15, 0.85)
+        ball_start_y = random.uniform(0.15, 0.45)
+        player_start_x = random.uniform(0.15, 0.85)
+        player_start_y = random.uniform(0.55, 0.85)
+
+        self.place(
+            (
+                self.width * player_start_x,
+                self.height * player_start_y,
+                self.width * ball_start_x,
+                self.height * ball_start_y,
+            )
+        )
+        # Drawn after the agent's placement, so one-player games (and
+        # their recordings) see the same random sequence as before
+        for player in self.other_players:
+            player.shape.place(
+                self.width * random.uniform(0.15, 0.85),
+                self.height * random.uniform(0.15, 0.85),
+            )
+
+    def place(self, placement: Placement) -> None:
+        player_x, player_y, ball_x, ball_y = placement
+        self.ball.shape.place(ball_x, ball_y)
+        self.player.shape.place(player_x, player_y)
+        self.placement = placement
+        self.n_placements += 1
+
+    def step(self, dt: float, actions: ActionArr) -> Tuple[int, bool, int]:
+        reward = 0
+
+        # Handle goal score
+        if self.goals.check_goal(self.ball, dt):
+            self.score += 1
+            self.place_players_and_ball()
+            reward = self.goals.goal_reward
+
+        # Handle player input: one row for the agent, or one per player
+        if actions.ndim == 1:
+            for direction, pressed in zip(ACTIONS_LIST, actions):
+                if pressed == 1:
+                    self.player.accelerate(direction)
+        else:
+            for player, player_actions in zip(self.players, actions):
+                for direction, pressed in zip(ACTIONS_LIST, player_actions):
+                    if pressed == 1:
+                        player.accelerate(direction)
+
+        # Handle collisions (with negative rewards)
+        if self.other_players:
+            kick_reward = self.resolve_contacts()
+            self.field.resolve_collisions(self.other_players)
+        else:
+            kick_reward = self.ball.handle_collision(self.player)
+        wall_reward = self.field.resolve_collisions(self.rewarded_shapes)
+        if kick_reward:
+            self.kicks += 1
+            reward += kick_reward
+        if wall_reward:
+            self.wall_hits += wall_reward // self.field.wall_reward
+            reward += wall_reward
+
+        # Update positions
+        for shape in self.shapes:
+            shape.update(dt)
+
+        return reward, False, self.score
+
+    def resolve_contacts(self) -> int:
+        """Kick apart touching shapes; return the agent's kick reward."""
+        shapes = self.shapes
+        ball_ix = len(shapes) - 1
+        if self.broadphase is None:
+            pairs = self.all_pairs
+        else:
+            pairs = self.broadphase.pairs([shape.shape for shape in shapes])
+
+        reward = 0
+        for i, j in pairs:
+            if j == ball_ix:
+                kick_reward = self.ball.handle_collision(self.players[i])
+                if i == 0:
+                    reward = kick_reward
+                continue
+            a = shapes[i].shape
+            b = shapes[j].shape
+            # Only kick players that are moving together, or two that
+            # still overlap after a kick would be pulled back in
+            if a.overlaps(b) and a.is_approaching(b):
+                a.kick(b)
+        return reward
+
+    def step_repeat(
+        self,
+        dt: float,
+        actions: ActionArr,
+        repeat: int = 1,
+        recorder: Optional[EpisodeRecorder] = None,
+    ) -> Tuple[int, bool, int]:
+        """Hold ``actions`` for ``repeat`` frames and sum their rewards.
+
+        Each frame is still recorded individually, so replays stay exact.
+        """
+        total_reward = 0
+        for _ in range(repeat):
+            reward, _, _ = self.step(dt, actions)
+            total_reward += reward
+            if recorder is not None:
+                recorder.record(self, actions)
+        return total_reward, False, self.score
+
+    def observe(self) -> StateArr:
+        """Agent observation; see ``ObservationBuilder`` for buffer reuse."""
+        return self.observer.observe(self.player.shape, self.ball.shape)
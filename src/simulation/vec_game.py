@@ -0,0 +1,211 @@
+from __future__ import annotations
+from typing import Optional, Tuple
+import numpy as np
+
+from src.components.shape import Shape
+from src.components.player import Player
+from src.components.ball import Ball
+from src.components.goals import Goals
+from src.components.field import Field
+from src.simulation.observation import STATE_SIZE, ObservationBuilder
+
+PLAYER = 0
+BALL = 1
+
+
+class VecGame:
+    """N independent headless games stepped together in NumPy arrays.
+
+    Positions and velocities are struct-of-arrays buffers of shape
+    ``(2, num_games)`` indexed by entity (``PLAYER``, ``BALL``) then game.
+    ``step`` mirrors ``Simulation.step`` for every game at once and
+    auto-resets games that hit ``game_duration_frames``.
+    """
+
+    def __init__(
+        self,
+        num_games: int,
+        width: int,
+        height: int,
+        game_duration_frames: int,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.game_duration_frames = game_duration_frames
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros((2, num_games))
+        self.y = np.zeros((2, num_games))
+        self.vx = np.zeros((2, num_games))
+        self.vy = np.zeros((2, num_games))
+        self.radius = np.array([[Player.radius], [Ball.radius]])
+
+        mass_player = Player.radius**2 * 3.14159
+        mass_ball = Ball.radius**2 * 3.14159
+        self.kick_factor_ball = 2 * mass_player / (mass_player + mass_ball)
+        self.kick_factor_player = 2 * mass_ball / (mass_player + mass_ball)
+
+        goal_left = (width * 0.4, height * 0.15)
+        goal_right = (width * 0.6, height * 0.15)
+        self.goal_left = np.array(goal_left)
+        self.goal_right = np.array(goal_right)
+        self.observer = ObservationBuilder(width, goal_left, goal_right, num_games)
+        self.field_x0 = width * 0.1
+        self.field_y0 = height * 0.1
+        self.field_x1 = self.field_x0 + width * 0.8
+        self.field_y1 = self.field_y0 + height * 0.8
+
+        self.scores = np.zeros(num_games, dtype=np.int64)
+        self.frames = np.zeros(num_games, dtype=np.int64)
+
+    def reset(self) -> np.ndarray:
+        everything = np.ones(self.num_games, dtype=bool)
+        self.place_players_and_ball(everything)
+        self.scores[:] = 0
+        self.frames[:] = 0
+        return self.observe()
+
+    def place_players_and_ball(self, mask: np.ndarray) -> None:
+        n = int(mask.sum())
+        if n == 0:
+            return
+        self.x[BALL, mask] = self.width * self.rng.uniform(0.15, 0.85, n)
+        self.y[BALL, mask] = self.height * self.rng.uniform(0.15, 0.45, n)
+        self.x[PLAYER, mask] = self.width * self.rng.uniform(0.15, 0.85, n)
+        self.y[PLAYER, mask] = self.height * self.rng.uniform(0.55, 0.85, n)
+        self.vx[:, mask] = 0.0
+        self.vy[:, mask] = 0.0
+
+    def step(
+        self, dt: float, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Advance every game by one frame.
+
+        ``actions`` is a ``(num_games, 4)`` one-hot array in the same
+        RIGHT, DOWN, LEFT, UP order as ``Simulation.step``. Returns
+        ``(observations, rewards, dones, scores)``; ``scores`` holds each
+        game's score before any auto-reset, and ``observations`` of
+        finished games are the first frame of their next game.
+        """
+        rewards = np.zeros(self.num_games)
+
+        # Handle goal score
+        goals = self.check_goal(dt)
+        self.scores += goals
+        self.place_players_and_ball(goals)
+        rewards[goals] = Goals.goal_reward
+
+        # Handle player input
+        self.vx[PLAYER] += Shape.acceleration * (actions[:, 0] - actions[:, 2])
+        self.vy[PLAYER] += Shape.acceleration * (actions[:, 1] - actions[:, 3])
+
+        # Handle collisions (with negative rewards)
+        rewards += Ball.kick_reward * self.kick()
+        rewards += Field.wall_reward * self.resolve_collisions()
+
+        # Update positions
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        drag = Shape.drag_coefficient * np.hypot(self.vx, self.vy)
+        self.vx -= drag * self.vx
+        self.vy -= drag * self.vy
+
+        self.frames += 1
+        dones = self.frames >= self.game_duration_frames
+        scores = self.scores.copy()
+
+        if dones.any():
+            self.place_players_and_ball(dones)
+            self.scores[dones] = 0
+            self.frames[dones] = 0
+
+        return self.observe(), rewards, dones, scores
+
+    def check_goal(self, dt: float) -> np.ndarray:
+        # Vectorised form of Goals.check_goal
+        trail_x = -5 * dt * self.vx[BALL]
+        trail_y = -5 * dt * self.vy[BALL]
+        post_x, post_y = self.goal_right - self.goal_left
+        rel_x = self.x[BALL] - self.goal_left[0]
+        rel_y = self.y[BALL] - self.goal_left[1]
+
+        denom = post_x * trail_y - post_y * trail_x
+        moving = (self.vx[BALL] != 0.0) | (self.vy[BALL] != 0.0)
+        valid = moving & (denom != 0.0)
+        safe_denom = np.where(valid, denom, 1.0)
+        t = (rel_x * trail_y - rel_y * trail_x) / safe_denom
+        u = (rel_x * post_y - rel_y * post_x) / safe_denom
+
+        return valid & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+    def kick(self) -> np.ndarray:
+        # Vectorised form of Ball.handle_collision / Shape.kick
+        pos_diff_x = self.x[BALL] - self.x[PLAYER]
+        pos_diff_y = self.y[BALL] - self.y[PLAYER]
+        distance_sq = pos_diff_x**2 + pos_diff_y**2
+        overlaps = distance_sq < (Ball.radius + Player.radius) ** 2
+        kicked = overlaps & (distance_sq > 0.0)
+        if not kicked.any():
+            return overlaps
+
+        vel_diff_x = self.vx[BALL] - self.vx[PLAYER]
+        vel_diff_y = self.vy[BALL] - self.vy[PLAYER]
+        impulse = np.where(
+            kicked,
+            (vel_diff_x * pos_diff_x + vel_diff_y * pos_diff_y)
+            / np.where(kicked, distance_sq, 1.0),
+            0.0,
+        )
+        self.vx[BALL] -= self.kick_factor_ball * impulse * pos_diff_x
+        self.vy[BALL] -= self.kick_factor_ball * impulse * pos_diff_y
+        self.vx[PLAYER] += self.kick_factor_player * impulse * pos_diff_x
+        self.vy[PLAYER] += self.kick_factor_player * impulse * pos_diff_y
+        return overlaps
+
+    def resolve_collisions(self) -> np.ndarray:
+        # Vectorised form of Field.snap_to_colliding_boundary, edges in the
+        # same top, right, bottom, left order
+        r = self.radius
+        hits = np.zeros(self.x.shape, dtype=np.int64)
+
+        top = self.y - r <= self.field_y0
+        self.vy[top] *= -1
+        self.y = np.where(
+            top, self.field_y0 + r + np.abs(np.abs(self.field_y0 - self.y) - r), self.y
+        )
+        hits += top
+
+        right = self.x + r >= self.field_x1
+        self.vx[right] *= -1
+        self.x = np.where(
+            right,
+            self.field_x1 - (r + np.abs(np.abs(self.field_x1 - self.x) - r)),
+            self.x,
+        )
+        hits += right
+
+        bottom = self.y + r >= self.field_y1
+        self.vy[bottom] *= -1
+        self.y = np.where(
+            bottom,
+            self.field_y1 - (r + np.abs(np.abs(self.field_y1 - self.y) - r)),
+            self.y,
+        )
+        hits += bottom
+
+        left = self.x - r <= self.field_x0
+        self.vx[left] *= -1
+        self.x = np.where(
+            left, self.field_x0 + r + np.abs(np.abs(self.field_x0 - self.x) - r), self.x
+        )
+        hits += left
+
+        return hits.sum(axis=0)
+
+    def observe(self) -> np.ndarray:
+        # Same features as Agent.get_state, one row per game
+        return self.observer.observe_batch(
+            self.x[PLAYER], self.y[PLAYER], self.x[BALL], self.y[BALL]
+        )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import csv
+import math
+import os
+import time
+from typing import Iterable, Optional, TextIO
+
+FIELDS = (
+    "game",
+    "score",
+    "mean_score",
+    "record",
+    "total_reward",
+    "frames",
+    "wall_time",
+    "epsilon",
+)
+
+
+class RunningStats:
+    """Incremental count/mean/variance/max (Welford), O(1) per update."""
+
+    __slots__ = ("count", "mean", "m2", "max")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = -math.inf
+        for value in values:
+            self.update(value)
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.max = max(self.max, value)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+
+class MetricsLog:
+    """Per-game training metrics appended to a CSV file.
+
+    Each ``log`` call writes and flushes one row, so a viewer can tail the
+    file while training runs (see ``src.visuals.plot``). Score statistics
+    are kept incrementally rather than recomputed from the full history.
+    """
+
+    def __init__(self, path: str, previous_scores: Iterable[int] = ()) -> None:
+        self.path = path
+        self.scores = RunningStats(previous_scores)
+        self.start = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.isfile(path) or os.path.getsize(path) == 0
+        self.file: Optional[TextIO] = open(path, "a", newline="")
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        if is_new:
+            self.writer.writerow(FIELDS)
+            self.file.flush()
+
+    def log(
+        self,
+        score: int,
+        total_reward: float,
+        frames: int,
+        epsilon: float,
+    ) -> float:
+        """Record one finished game and return the running mean score."""
+        self.scores.update(score)
+        self.writer.writerow(
+            (
+                self.scores.count,
+                score,
+                f"{self.scores.mean:.4f}",
+                int(self.scores.max),
+                f"{total_reward:g}",
+                frames,
+                f"{time.monotonic() - self.start:.3f}",
+                f"{epsilon:g}",
+            )
+        )
+        if self.file is not None:
+            self.file.flush()
+        return self.scores.mean
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,13 +1,34 @@
+"""Live plot of a training metrics log, run separately from training.
+
+    python -m src.visuals.plot [checkpoints/metrics.csv]
+
+Tails the CSV written by ``MetricsLog`` and only reads rows appended since
+the previous refresh.
+"""
+import csv
+import os
+import sys
+from typing import List, TextIO
+
 import matplotlib.pyplot as plt  # type: ignore
-from IPython import display
-from typing import List
 
-plt.ion()
+REFRESH_SECONDS = 2.0
+DEFAULT_PATH = "checkpoints/metrics.csv"
+
+
+def read_new_rows(f: TextIO) -> List[List[str]]:
+    rows: List[List[str]] = []
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line.endswith("\n"):
+            # Partially written row; try again on the next refresh
+            f.seek(position)
+            return rows
+        rows.extend(csv.reader([line]))
 
 
 def plot(scores: List[int], mean_scores: List[float]) -> None:
-    display.clear_output(wait=True)  # type: ignore
-    display.display(plt.gcf())  # type: ignore
     plt.clf()
     plt.title("Training..")
     plt.xlabel("Number of Games")
@@ -15,5 +36,32 @@ def plot(scores: List[int], mean_scores: List[float]) -> None:
     plt.plot(scores)
     plt.plot(mean_scores)
     plt.ylim(ymin=0)
-    plt.text(len(scores) - 1, scores[-1], str(scores[-1]))
-    plt.text(len(mean_scores) - 1, mean_scores[-1], str(mean_scores[-1]))
+    if scores:
+        plt.text(len(scores) - 1, scores[-1], str(scores[-1]))
+        plt.text(len(mean_scores) - 1, mean_scores[-1], str(mean_scores[-1]))
+
+
+def tail(path: str) -> None:
+    plt.ion()
+    scores: List[int] = []
+    mean_scores: List[float] = []
+
+    while not os.path.isfile(path):
+        print(f"Waiting for {path}...")
+        plt.pause(REFRESH_SECONDS)
+
+    with open(path, newline="") as f:
+        header = next(csv.reader([f.readline()]))
+        score_ix = header.index("score")
+        mean_ix = header.index("mean_score")
+        while True:
+            rows = read_new_rows(f)
+            if rows:
+                scores.extend(int(row[score_ix]) for row in rows)
+                mean_scores.extend(float(row[mean_ix]) for row in rows)
+                plot(scores, mean_scores)
+            plt.pause(REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    tail(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
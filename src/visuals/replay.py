@@ -0,0 +1,130 @@
+"""Watch or summarise recorded episodes without loading the model.
+
+    python -m src.visuals.replay checkpoints/episodes.bin --stats
+    python -m src.visuals.replay checkpoints/episodes.bin -e 12 -s 4 --seek 600
+
+Episodes are re-simulated from their recorded placements and actions.
+While watching: space pauses, left/right seek by one second, up/down
+double or halve the speed.
+"""
+import argparse
+import sys
+from typing import List, Optional
+import numpy as np
+
+from src.simulation.recording import (
+    BITMASK_ACTIONS,
+    Episode,
+    ReplaySimulation,
+    read_episodes,
+)
+
+DISPLAY_FPS = 60
+DIRECTIONS = ("right", "down", "left", "up")
+
+
+def print_stats(episodes: List[Episode]) -> None:
+    print(
+        f"{'episode':>7s} {'frames':>7s} {'score':>5s} {'reward':>9s} "
+        f"{'placed':>6s} "
+        + " ".join(f"{d:>6s}" for d in DIRECTIONS)
+        + f" {'idle':>6s} {'speed':>7s} {'ball px':>9s}"
+    )
+    for ix, episode in enumerate(episodes):
+        pressed = BITMASK_ACTIONS[episode.actions]
+        shares = pressed.mean(axis=0) if episode.n_frames else np.zeros(4)
+        idle = (episode.actions == 0).mean() if episode.n_frames else 0.0
+        line = (
+            f"{ix:7d} {episode.n_frames:7d} {episode.score:5d} "
+            f"{episode.total_reward:9g} {len(episode.placements):6d} "
+            + " ".join(f"{share:6.1%}" for share in shares)
+            + f" {idle:6.1%}"
+        )
+        states = episode.states
+        if states is not None and len(states) > 1:
+            player_speed = np.hypot(states[:, 2], states[:, 3]).mean()
+            ball_path = np.hypot(*np.diff(states[:, 4:6], axis=0).T).sum()
+            line += f" {player_speed:7.1f} {ball_path:9.0f}"
+        print(line)
+
+    if episodes:
+        scores = np.array([episode.score for episode in episodes])
+        print(
+            f"{len(episodes)} episodes, mean score {scores.mean():.2f}, "
+            f"max {scores.max()}, {sum(e.n_frames for e in episodes)} frames"
+        )
+
+
+def watch(episode: Episode, speed: float, seek: int) -> None:
+    import pygame
+
+    from src.game.game import Game
+
+    game = Game(
+        height=episode.height,
+        width=episode.width,
+        fps=DISPLAY_FPS,
+        game_duration_frames=episode.n_frames,
+    )
+    sim = ReplaySimulation(episode)
+    game.sim = sim
+    game.reset_game()
+    sim.seek(seek)
+
+    frames_per_second = round(1 / episode.dt)
+    paused = False
+    owed = 0.0  # fractional frames carried between display ticks
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                game.quit()
+                return
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                paused = not paused
+            elif event.key == pygame.K_RIGHT:
+                sim.seek(sim.frame + frames_per_second)
+            elif event.key == pygame.K_LEFT:
+                sim.seek(sim.frame - frames_per_second)
+            elif event.key == pygame.K_UP:
+                speed *= 2
+            elif event.key == pygame.K_DOWN:
+                speed /= 2
+
+        if not paused and not sim.finished:
+            owed += speed * frames_per_second / DISPLAY_FPS
+            while owed >= 1 and not sim.finished:
+                sim.advance()
+                owed -= 1
+
+        pygame.display.set_caption(
+            f"Replay: frame {sim.frame}/{episode.n_frames}, {speed:g}x"
+            + (" (paused)" if paused else "")
+        )
+        game.draw()
+        game.clock.tick(DISPLAY_FPS)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="episode file written by EpisodeRecorder")
+    parser.add_argument(
+        "-e", "--episode", type=int, default=-1, help="index, negative from end"
+    )
+    parser.add_argument("-s", "--speed", type=float, default=1.0)
+    parser.add_argument("--seek", type=int, default=0, help="start at this frame")
+    parser.add_argument("--stats", action="store_true", help="print, don't watch")
+    args = parser.parse_args(argv)
+
+    episodes = list(read_episodes(args.path))
+    if args.stats:
+        print_stats(episodes)
+        return
+    if not episodes:
+        sys.exit(f"No complete episodes in {args.path}")
+    watch(episodes[args.episode], args.speed, args.seek)
+
+
+if __name__ == "__main__":
+    main()
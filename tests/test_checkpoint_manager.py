@@ -0,0 +1,51 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+from src.checkpoints.manager import CheckpointManager
+
+
+def add_all(
+    manager: CheckpointManager, directory: Path, checkpoints: List[Tuple[int, int]]
+) -> None:
+    for score, games in checkpoints:
+        path = directory / f"{score:04}_g{games:06}_checkpoint.tar"
+        path.write_bytes(b"checkpoint")
+        manager.add(str(path), score, games)
+
+
+def on_disk(directory: Path) -> List[str]:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".tar"))
+
+
+def test_keeps_top_and_last(tmp_path: Path) -> None:
+    manager = CheckpointManager(str(tmp_path), keep_top=2, keep_last=1)
+    add_all(manager, tmp_path, [(3, 1), (5, 2), (1, 3), (4, 4), (2, 5)])
+
+    expected = [
+        "0002_g000005_checkpoint.tar",
+        "0004_g000004_checkpoint.tar",
+        "0005_g000002_checkpoint.tar",
+    ]
+    assert on_disk(tmp_path) == expected
+    assert sorted(entry.file for entry in manager.entries) == expected
+    assert manager.best() == str(tmp_path / "0005_g000002_checkpoint.tar")
+    assert manager.latest() == str(tmp_path / "0002_g000005_checkpoint.tar")
+
+
+def test_keep_last_zero_keeps_only_top(tmp_path: Path) -> None:
+    manager = CheckpointManager(str(tmp_path), keep_top=1, keep_last=0)
+    add_all(manager, tmp_path, [(1, 1), (3, 2), (2, 3), (0, 4)])
+
+    assert on_disk(tmp_path) == ["0003_g000002_checkpoint.tar"]
+
+
+def test_index_survives_reload(tmp_path: Path) -> None:
+    manager = CheckpointManager(str(tmp_path), keep_top=2, keep_last=2)
+    add_all(manager, tmp_path, [(1, 1), (2, 2), (0, 3)])
+
+    reloaded = CheckpointManager(str(tmp_path))
+    assert reloaded.entries == manager.entries
+    assert reloaded.best() == manager.best()
+    assert reloaded.latest() == manager.latest()
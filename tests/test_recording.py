@@ -0,0 +1,56 @@
+from __future__ import annotations
+import random
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.simulation.recording import (
+    HEADER,
+    STATE_COLUMNS,
+    EpisodeRecorder,
+    read_episodes,
+)
+from src.simulation.simulation import Simulation
+
+FRAMES = 50
+
+
+def record(path: Path, record_states: bool) -> List[int]:
+    """Two episodes; returns the file size after each."""
+    random.seed(0)
+    sim = Simulation(400, 400, FRAMES)
+    recorder = EpisodeRecorder(str(path), record_states)
+    sizes = []
+    for _ in range(2):
+        sim.reset()
+        recorder.begin(sim)
+        for _ in range(FRAMES):
+            actions = np.eye(4, dtype=np.int64)[random.randrange(4)]
+            sim.step_repeat(1 / 60, actions, 1, recorder)
+        recorder.end(sim, 1 / 60, sim.score, 0.0)
+        sizes.append(path.stat().st_size)
+    recorder.close()
+    return sizes
+
+
+@pytest.mark.parametrize("record_states", [False, True])
+def test_truncated_episode_is_dropped(tmp_path: Path, record_states: bool) -> None:
+    path = tmp_path / "episodes.bin"
+    first, total = record(path, record_states)
+    assert len(list(read_episodes(str(path)))) == 2
+
+    data = path.read_bytes()
+    cuts = [1, 3, 4, 7, total - first - HEADER.size - 1]
+    if record_states:
+        cuts.append(32)  # exactly one state row
+    for cut in cuts:
+        path.write_bytes(data[: total - cut])
+        episodes = list(read_episodes(str(path)))
+        assert len(episodes) == 1, cut
+        episode = episodes[0]
+        assert len(episode.actions) == FRAMES
+        if record_states:
+            assert episode.states is not None
+            assert episode.states.shape == (FRAMES, STATE_COLUMNS)